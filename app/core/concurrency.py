@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import partial
+from typing import ParamSpec, TypeVar
+from weakref import WeakKeyDictionary
+
+import anyio
+import anyio.to_thread
+
+from app.core.config import BLOCKING_THREADS
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_limiters: WeakKeyDictionary[asyncio.AbstractEventLoop, anyio.CapacityLimiter] = WeakKeyDictionary()
+
+
+def blocking_limiter() -> anyio.CapacityLimiter:
+    """Per-loop limiter bounding how many threads SQLite/Jinja work may occupy."""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = anyio.CapacityLimiter(BLOCKING_THREADS)
+    return limiter
+
+
+async def run_blocking(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run synchronous DB or template work in the bounded worker pool."""
+    return await anyio.to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=blocking_limiter()
+    )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from email.utils import format_datetime
+
+from fastapi import Request, Response
+
+from app.services import data_version
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same version.
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def validator_headers(
+    version: data_version.DataVersion,
+    *,
+    variant: str | None = None,
+    vary: str | None = None,
+) -> dict[str, str]:
+    etag = version.etag
+    if variant:
+        # One ETag per representation of the same data (e.g. JSON vs NDJSON).
+        etag = f'{etag[:-1]}-{variant}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(version.modified_at, usegmt=True),
+        # Cacheable, but always revalidated: the 304 path is what makes polling cheap.
+        "Cache-Control": "no-cache",
+    }
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified(
+    request: Request, *, variant: str | None = None, vary: str | None = None
+) -> tuple[Response | None, dict[str, str]]:
+    """Conditional GET against the global data version.
+
+    Returns a ready 304 when ``If-None-Match`` matches, else ``None``, plus the
+    validator headers to put on the full response. Call it before any query or
+    rendering. ``If-Modified-Since`` alone is not honoured: its one-second resolution
+    would hide a write made later in the same second.
+
+    Endpoints that negotiate their format pass the chosen ``variant`` (suffixed to the
+    ETag) and the request header it depends on as ``vary``.
+    """
+    headers = validator_headers(data_version.current(), variant=variant, vary=vary)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers), headers
+    return None, headers
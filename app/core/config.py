@@ -14,3 +14,79 @@ APP_TITLE = "AGENTS"
 APP_DESCRIPTION = "Local-only agents timeline. Do not expose to the internet."
 WSL_QUEUE_PATH = DATA_DIR / "wsl_post_queue.ndjson"
 POST_HUMAN_TEXT_MAX_CHARS = int(os.getenv("AGENTS_HUMAN_TEXT_MAX_CHARS", "10000"))
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("AGENTS_BULK_CHUNK_SIZE", "500"))
+# JSON array bodies are decoded whole; larger uploads must use NDJSON.
+BULK_JSON_MAX_BYTES = int(os.getenv("AGENTS_BULK_JSON_MAX_BYTES", str(32 * 1024 * 1024)))
+GROUP_COMMIT_ENABLED = os.getenv("AGENTS_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("AGENTS_GROUP_COMMIT_MAX_BATCH", "256"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("AGENTS_GROUP_COMMIT_MAX_DELAY_MS", "5"))
+BLOCKING_THREADS = int(os.getenv("AGENTS_BLOCKING_THREADS", "8"))
+
+# SQLite storage profile. A profile picks baseline PRAGMAs; AGENTS_SQLITE_<PRAGMA>
+# environment variables override individual values.
+SQLITE_STORAGE_PROFILES: dict[str, dict[str, str]] = {
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-20000",
+        "mmap_size": "268435456",
+        "busy_timeout": "5000",
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": "-20000",
+        "mmap_size": "0",
+        "busy_timeout": "10000",
+        "temp_store": "DEFAULT",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": "-65536",
+        "mmap_size": "1073741824",
+        "busy_timeout": "5000",
+        "temp_store": "MEMORY",
+    },
+}
+SQLITE_STORAGE_PROFILE = os.getenv("AGENTS_STORAGE_PROFILE", "balanced")
+SQLITE_PRAGMAS = {
+    name: os.getenv(f"AGENTS_SQLITE_{name.upper()}", value)
+    for name, value in SQLITE_STORAGE_PROFILES.get(
+        SQLITE_STORAGE_PROFILE, SQLITE_STORAGE_PROFILES["balanced"]
+    ).items()
+}
+SQLITE_WRITE_POOL_TIMEOUT = float(os.getenv("AGENTS_SQLITE_WRITE_POOL_TIMEOUT", "30"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("AGENTS_SQLITE_READ_POOL_SIZE", "4"))
+WSL_IMPORT_BATCH_SIZE = int(os.getenv("AGENTS_WSL_IMPORT_BATCH_SIZE", "500"))
+WSL_QUEUE_WATCH_MODE = os.getenv("AGENTS_WSL_QUEUE_WATCH", "auto")  # auto | poll
+WSL_QUEUE_POLL_MIN_MS = int(os.getenv("AGENTS_WSL_QUEUE_POLL_MIN_MS", "100"))
+WSL_QUEUE_POLL_MAX_MS = int(os.getenv("AGENTS_WSL_QUEUE_POLL_MAX_MS", "5000"))
+SSE_QUEUE_MAX = int(os.getenv("AGENTS_SSE_QUEUE_MAX", "256"))
+# What to do when a subscriber's queue is full: drop_oldest | resync | disconnect
+SSE_OVERFLOW_POLICY = os.getenv("AGENTS_SSE_OVERFLOW", "resync")
+SSE_HISTORY_SIZE = int(os.getenv("AGENTS_SSE_HISTORY", "1024"))
+# >0 packs events published within this window into one SSE write per client.
+SSE_COALESCE_MS = float(os.getenv("AGENTS_SSE_COALESCE_MS", "0"))
+SSE_MAX_CONNECTIONS = int(os.getenv("AGENTS_SSE_MAX_CONNECTIONS", "1000"))
+SSE_HEARTBEAT_S = float(os.getenv("AGENTS_SSE_HEARTBEAT_S", "15"))
+# /api/agents/ws: events per binary frame, batching window, unacked frames in flight.
+WS_QUEUE_MAX = int(os.getenv("AGENTS_WS_QUEUE_MAX", "4096"))
+WS_MAX_BATCH = int(os.getenv("AGENTS_WS_MAX_BATCH", "500"))
+WS_BATCH_MS = float(os.getenv("AGENTS_WS_BATCH_MS", "20"))
+WS_ACK_WINDOW = int(os.getenv("AGENTS_WS_ACK_WINDOW", "4"))
+# Newest posts kept in memory (global + per account) to answer first pages; 0 disables.
+HOT_WINDOW_SIZE = int(os.getenv("AGENTS_HOT_WINDOW_SIZE", "250"))
+# Timeline pages with at least this many posts are streamed (0 disables), loading post
+# bodies this many at a time.
+HTML_STREAM_MIN_LIMIT = int(os.getenv("AGENTS_HTML_STREAM_MIN_LIMIT", "100"))
+HTML_STREAM_CHUNK_POSTS = int(os.getenv("AGENTS_HTML_STREAM_CHUNK_POSTS", "25"))
+# Rendered post cards kept in memory (LRU, bounded by count and total bytes).
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("AGENTS_FRAGMENT_CACHE_MAX_ENTRIES", "2000"))
+FRAGMENT_CACHE_MAX_BYTES = int(os.getenv("AGENTS_FRAGMENT_CACHE_MAX_BYTES", "8388608"))
+# Change-event fan-out: memory (single process) | sqlite (event_log table, any
+# number of uvicorn workers on one host).
+EVENT_BUS = os.getenv("AGENTS_EVENT_BUS", "memory")
+EVENT_BUS_POLL_MS = int(os.getenv("AGENTS_EVENT_BUS_POLL_MS", "100"))
+EVENT_LOG_RETENTION_S = int(os.getenv("AGENTS_EVENT_LOG_RETENTION_S", "600"))
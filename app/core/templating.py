@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from fastapi.templating import Jinja2Templates
+
+# One environment (and template cache) shared by page routes and server-pushed fragments.
+templates = Jinja2Templates(directory="app/templates")
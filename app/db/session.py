@@ -1,17 +1,66 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import DB_URL
+from app.core.config import (
+    DB_URL,
+    SQLITE_PRAGMAS,
+    SQLITE_READ_POOL_SIZE,
+    SQLITE_WRITE_POOL_TIMEOUT,
+)
+
+
+def _install_pragmas(engine: Engine, *, read_only: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                # journal_mode is persistent in the file; only the writer switches it.
+                if read_only and name == "journal_mode":
+                    continue
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
 
-engine = create_engine(
+# The single writer connection. Writers queue on the pool (up to
+# AGENTS_SQLITE_WRITE_POOL_TIMEOUT seconds) instead of contending for SQLite's write
+# lock, so code holding a write session must not wait on another writer.
+write_engine = create_engine(
     DB_URL,
     connect_args={"check_same_thread": False},
-    pool_pre_ping=True,
+    pool_size=1,
+    max_overflow=0,
+    pool_timeout=SQLITE_WRITE_POOL_TIMEOUT,
 )
+_install_pragmas(write_engine, read_only=False)
+
+# Read-only connections; under WAL they read the last committed snapshot and never
+# wait on the writer.
+read_engine = create_engine(
+    DB_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=SQLITE_READ_POOL_SIZE,
+    max_overflow=SQLITE_READ_POOL_SIZE,
+)
+_install_pragmas(read_engine, read_only=True)
+
+engine = write_engine
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+def init_database() -> None:
+    """Open the writer once so the file is switched to the configured journal mode (WAL)
+    before any reader connects; readers leave journal_mode alone."""
+    with write_engine.connect():
+        pass
+
+
+SessionLocal = sessionmaker(bind=write_engine, autoflush=False, autocommit=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
 
 
 def get_db():
@@ -20,3 +69,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -12,10 +12,40 @@ from fastapi.responses import JSONResponse
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.core.config import APP_DESCRIPTION, APP_TITLE, WSL_QUEUE_PATH
-from app.db.session import SessionLocal
+from app.core.concurrency import run_blocking
+from app.core.config import (
+    APP_DESCRIPTION,
+    APP_TITLE,
+    EVENT_BUS,
+    EVENT_BUS_POLL_MS,
+    EVENT_LOG_RETENTION_S,
+    GROUP_COMMIT_ENABLED,
+    GROUP_COMMIT_MAX_BATCH,
+    GROUP_COMMIT_MAX_DELAY_MS,
+    SSE_HEARTBEAT_S,
+    SSE_HISTORY_SIZE,
+    SSE_MAX_CONNECTIONS,
+    SSE_OVERFLOW_POLICY,
+    SSE_QUEUE_MAX,
+    WSL_QUEUE_PATH,
+    WSL_QUEUE_POLL_MAX_MS,
+    WSL_QUEUE_POLL_MIN_MS,
+    WSL_QUEUE_WATCH_MODE,
+)
+from app.db.session import (
+    ReadSessionLocal,
+    SessionLocal,
+    init_database,
+    read_engine,
+    write_engine,
+)
 from app.routers import api_accounts, api_posts, api_scenes, api_system, events, pages
+from app.services import change_events, hot_window
 from app.services.broadcast import Broadcaster
+from app.services.connections import ConnectionManager
+from app.services.event_bus import create_event_bus
+from app.services.group_commit import GroupCommitWriter
+from app.services.queue_watch import watch_wsl_queue
 from app.services.system_posts import create_system_post, post_update_if_changed
 from app.services.wsl_queue import drain_wsl_queue
 
@@ -43,23 +73,67 @@ def bootstrap_system_post() -> None:
         db.close()
 
 
+def warm_hot_window() -> None:
+    if os.getenv("PYTEST_CURRENT_TEST"):
+        return
+    db = ReadSessionLocal()
+    try:
+        hot_window.seed(db)
+    except Exception:
+        logging.exception("Hot window warm-up failed")
+    finally:
+        db.close()
+
+
+def _drain_wsl_queue_once() -> int:
+    db = SessionLocal()
+    try:
+        return drain_wsl_queue(db, WSL_QUEUE_PATH)
+    finally:
+        db.close()
+
+
 async def _wsl_queue_worker() -> None:
-    while True:
-        db = SessionLocal()
-        try:
-            imported = drain_wsl_queue(db, WSL_QUEUE_PATH)
-            if imported:
-                logging.info("Imported %s queued WSL progress posts", imported)
-        except Exception:
-            logging.exception("WSL queue worker failed")
-        finally:
-            db.close()
-        await asyncio.sleep(2)
+    async def drain() -> int:
+        return await run_blocking(_drain_wsl_queue_once)
+
+    await watch_wsl_queue(
+        WSL_QUEUE_PATH,
+        drain,
+        mode=WSL_QUEUE_WATCH_MODE,
+        poll_min_ms=WSL_QUEUE_POLL_MIN_MS,
+        poll_max_ms=WSL_QUEUE_POLL_MAX_MS,
+    )
 
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # WAL must be on before the first reader connects.
+    await run_blocking(init_database)
+    bus = create_event_bus(
+        EVENT_BUS,
+        app.state.broadcaster,
+        asyncio.get_running_loop(),
+        write_engine=write_engine,
+        read_engine=read_engine,
+        poll_ms=EVENT_BUS_POLL_MS,
+        retention_s=EVENT_LOG_RETENTION_S,
+    )
+    await bus.start()
+    app.state.event_bus = bus
+    # Service-layer writes (worker threads included) publish through the bus.
+    change_events.attach(bus)
+    app.state.connections.start()
     bootstrap_system_post()
+    await run_blocking(warm_hot_window)
+    if GROUP_COMMIT_ENABLED:
+        writer = GroupCommitWriter(
+            SessionLocal,
+            max_batch=GROUP_COMMIT_MAX_BATCH,
+            max_delay_ms=GROUP_COMMIT_MAX_DELAY_MS,
+        )
+        writer.start()
+        app.state.group_commit = writer
     task = asyncio.create_task(_wsl_queue_worker())
     app.state.wsl_queue_task = task
     try:
@@ -68,11 +142,25 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await task
+        if app.state.group_commit is not None:
+            await app.state.group_commit.stop()
+            app.state.group_commit = None
+        await app.state.connections.stop()
+        change_events.detach()
+        await bus.stop()
+        app.state.event_bus = None
 
 
 app = FastAPI(title=APP_TITLE, description=APP_DESCRIPTION, lifespan=lifespan)
 
-app.state.broadcaster = Broadcaster()
+app.state.broadcaster = Broadcaster(
+    max_queue=SSE_QUEUE_MAX, policy=SSE_OVERFLOW_POLICY, history_size=SSE_HISTORY_SIZE
+)
+app.state.connections = ConnectionManager(
+    app.state.broadcaster, max_connections=SSE_MAX_CONNECTIONS, heartbeat_s=SSE_HEARTBEAT_S
+)
+app.state.group_commit = None
+app.state.event_bus = None
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -84,8 +172,7 @@ app.include_router(api_system.router)
 app.include_router(events.router)
 
 
-@app.exception_handler(Exception)
-async def unhandled_exception_handler(request: Request, exc: Exception):
+def _write_incident_post(path: str, method: str, exc: Exception) -> None:
     db = SessionLocal()
     try:
         create_system_post(
@@ -96,12 +183,17 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
             result_summary="Request failed",
             error_summary=str(exc)[:1000],
             tags_csv="system,incident",
-            raw_payload={"path": str(request.url.path), "method": request.method},
+            raw_payload={"path": path, "method": method},
         )
     except Exception:
         logging.exception("Failed to write incident post")
     finally:
         db.close()
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    await run_blocking(_write_incident_post, str(request.url.path), request.method, exc)
     return JSONResponse(status_code=500, content={"detail": "Internal Server Error"})
 
 
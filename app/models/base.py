@@ -1,7 +1,18 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp, matching what SQLite's CURRENT_TIMESTAMP stores.
+
+    Generated client-side so every stored value has the same microsecond format,
+    which keeps string comparisons in keyset cursors exact.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
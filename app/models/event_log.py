@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, utcnow
+
+
+class EventLog(Base):
+    """Change events shared between worker processes (``AGENTS_EVENT_BUS=sqlite``).
+
+    AUTOINCREMENT keeps ids strictly increasing after old rows are pruned; they double
+    as SSE event ids, so every worker hands out the same id for the same event.
+    """
+
+    __tablename__ = "event_log"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event: Mapped[str] = mapped_column(String(50))
+    data_json: Mapped[str] = mapped_column(Text)
+    # Writing worker, so it can skip invalidations it already applied in-line.
+    origin_pid: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, index=True)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, utcnow
+
+
+class ImportCheckpoint(Base):
+    """Byte offset up to which a queue file has been imported.
+
+    Written in the same transaction as the imported rows, so a crash can neither lose
+    nor repeat a committed batch.
+    """
+
+    __tablename__ = "import_checkpoints"
+
+    source: Mapped[str] = mapped_column(String(500), primary_key=True)
+    offset: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, onupdate=utcnow)
@@ -2,11 +2,25 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
-from app.models.base import Base
+from app.models.base import Base, utcnow
+
+# Cards show at most this many characters of human_text (migration 0008 backfills it).
+PREVIEW_CHARS = 280
+
+
+def make_preview(human_text: str | None) -> str:
+    text = human_text or ""
+    return text if len(text) <= PREVIEW_CHARS else text[: PREVIEW_CHARS - 1] + "…"
+
+
+def _default_preview(context: Any) -> str:
+    # Core inserts (bulk, group commit) carry only human_text.
+    return make_preview(context.get_current_parameters().get("human_text"))
 
 
 class PostStatus(str, Enum):
@@ -17,6 +31,10 @@ class PostStatus(str, Enum):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Keyset pagination of per-account timelines: (account_id, created_at, id).
+        Index("ix_posts_account_created_id", "account_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     account_id: Mapped[int | None] = mapped_column(ForeignKey("accounts.id"), index=True)
@@ -27,6 +45,8 @@ class Post(Base):
     when_ts: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     human_text: Mapped[str] = mapped_column(Text, default="")
+    # Card text precomputed from human_text, so timelines never load the full body.
+    preview: Mapped[str] = mapped_column(String(PREVIEW_CHARS), default=_default_preview)
     goal: Mapped[str] = mapped_column(Text, default="")
     result_summary: Mapped[str] = mapped_column(Text, default="")
 
@@ -43,9 +63,39 @@ class Post(Base):
     tags_csv: Mapped[str] = mapped_column(String(400), default="")
     raw_payload_json: Mapped[str] = mapped_column(Text, default="")
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
-    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, index=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, onupdate=utcnow)
 
     account = relationship("Account")
+    tag_links: Mapped[list[PostTag]] = relationship(cascade="all, delete-orphan")
+
+    @validates("human_text")
+    def _sync_preview(self, _key: str, value: str | None) -> str | None:
+        self.preview = make_preview(value)
+        return value
+
+    @validates("tags_csv")
+    def _sync_tag_links(self, _key: str, value: str | None) -> str | None:
+        # post_tags mirrors tags_csv for every ORM write (create, PATCH, forms).
+        self.tag_links = [PostTag(tag=tag) for tag in parse_tags(value)]
+        return value
+
+
+class PostTag(Base):
+    """Normalized, indexed copy of ``Post.tags_csv`` (one row per tag)."""
+
+    __tablename__ = "post_tags"
+    __table_args__ = (Index("ix_post_tags_tag_post", "tag", "post_id"),)
+
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id"), primary_key=True)
+    tag: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+
+def parse_tags(tags_csv: str | None) -> list[str]:
+    """Split a tags CSV into unique, stripped tags, keeping their order."""
+    seen: dict[str, None] = {}
+    for part in (tags_csv or "").split(","):
+        tag = part.strip()
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)
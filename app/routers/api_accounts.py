@@ -3,7 +3,8 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.core.concurrency import run_blocking
+from app.db.session import get_db, get_read_db
 from app.models.account import Account
 from app.schemas.account import AccountCreate, AccountOut, AccountUpdate
 from app.services.accounts import delete_account, get_account, list_accounts, upsert_account
@@ -12,19 +13,19 @@ router = APIRouter(prefix="/api/agents/accounts", tags=["Accounts"])
 
 
 @router.get("", response_model=list[AccountOut])
-async def list_accounts_api(db: Session = Depends(get_db)):
-    return list_accounts(db)
+async def list_accounts_api(db: Session = Depends(get_read_db)):
+    return await run_blocking(list_accounts, db)
 
 
 @router.post("", response_model=AccountOut)
 async def create_account_api(payload: AccountCreate, db: Session = Depends(get_db)):
     account = Account(**payload.model_dump())
-    return upsert_account(db, account)
+    return await run_blocking(upsert_account, db, account)
 
 
 @router.get("/{account_id}", response_model=AccountOut)
-async def get_account_api(account_id: int, db: Session = Depends(get_db)):
-    account = get_account(db, account_id)
+async def get_account_api(account_id: int, db: Session = Depends(get_read_db)):
+    account = await run_blocking(get_account, db, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
@@ -34,21 +35,19 @@ async def get_account_api(account_id: int, db: Session = Depends(get_db)):
 async def update_account_api(
     account_id: int, payload: AccountUpdate, db: Session = Depends(get_db)
 ):
-    account = get_account(db, account_id)
+    account = await run_blocking(get_account, db, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     update_data = payload.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(account, key, value)
-    return upsert_account(db, account)
+    return await run_blocking(upsert_account, db, account)
 
 
 @router.delete("/{account_id}")
-async def delete_account_api(
-    account_id: int, cascade: bool = False, db: Session = Depends(get_db)
-):
-    account = get_account(db, account_id)
+async def delete_account_api(account_id: int, cascade: bool = False, db: Session = Depends(get_db)):
+    account = await run_blocking(get_account, db, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
-    delete_account(db, account, cascade=cascade)
+    await run_blocking(delete_account, db, account, cascade=cascade)
     return {"status": "deleted", "cascade": cascade}
@@ -1,23 +1,44 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import Any, Literal
 
 import orjson
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.core.concurrency import run_blocking
+from app.core.conditional import not_modified
+from app.db.session import get_db, get_read_db
 from app.models.post import Post
-from app.schemas.post import PostCreate, PostOut, PostUpdate
-from app.services.broadcast import EventPayload
+from app.schemas.post import (
+    BulkIngestOut,
+    PostCreate,
+    PostOut,
+    PostUpdate,
+    SearchHitOut,
+    TagCount,
+)
+from app.services.bulk_ingest import (
+    BulkBodyTooLarge,
+    ingest_bulk,
+    is_ndjson,
+    iter_bulk_items,
+)
 from app.services.posts import (
     create_post,
+    decode_cursor,
     delete_post,
+    encode_cursor,
     get_post,
     list_posts,
     update_post,
 )
+from app.services.search import search_posts
+from app.services.tags import tag_counts
 
 router = APIRouter(prefix="/api/agents/posts", tags=["posts"])
 
@@ -30,30 +51,122 @@ def _normalize_raw_payload(value: Any) -> str:
     return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
 
 
+# NDJSON lines are encoded and written this many rows at a time.
+_NDJSON_CHUNK_ROWS = 500
+
+
+def _post_json(post: Row) -> dict[str, Any]:
+    # ``list_posts(view="rows")`` rows carry the PostOut columns in schema order.
+    return post._asdict()
+
+
+def _accepts_ndjson(accept: str | None) -> bool:
+    return any(is_ndjson(part) for part in (accept or "").split(","))
+
+
+def _ndjson_lines(posts: Sequence[Row]) -> Iterator[bytes]:
+    for start in range(0, len(posts), _NDJSON_CHUNK_ROWS):
+        chunk = posts[start : start + _NDJSON_CHUNK_ROWS]
+        yield b"".join(orjson.dumps(_post_json(post)) + b"\n" for post in chunk)
+
+
+def _post_row(item: Any) -> dict[str, Any]:
+    payload = item if isinstance(item, PostCreate) else PostCreate.model_validate(item)
+    row = payload.model_dump()
+    row["raw_payload_json"] = _normalize_raw_payload(row["raw_payload_json"])
+    return row
+
+
 @router.post("", response_model=PostOut)
 async def create_post_api(
     payload: PostCreate,
-    background: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
-    post = Post(**payload.model_dump())
-    post.raw_payload_json = _normalize_raw_payload(payload.raw_payload_json)
-    post = create_post(db, post)
-
-    async def _publish() -> None:
-        event = EventPayload(
-            event="new_post",
-            data={
-                "post_id": post.id,
-                "created_at": post.created_at.isoformat(),
-                "account_id": post.account_id,
-            },
-            created_at=datetime.now(timezone.utc),
+    writer = request.app.state.group_commit
+    if writer is not None:
+        post = PostOut.model_validate(await writer.submit(_post_row(payload)))
+    else:
+        post = Post(**payload.model_dump())
+        post.raw_payload_json = _normalize_raw_payload(payload.raw_payload_json)
+        post = await run_blocking(create_post, db, post)
+    return post
+
+
+@router.post("/bulk", response_model=BulkIngestOut)
+async def create_posts_bulk_api(
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """Ingest a JSON array or an NDJSON stream of posts in chunked transactions."""
+    items = iter_bulk_items(request.stream(), ndjson=is_ndjson(request.headers.get("content-type")))
+    try:
+        result = await ingest_bulk(db, items, _post_row)
+    except BulkBodyTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return result
+
+
+@router.get("/tags", response_model=list[TagCount])
+async def list_tags_api(
+    account_id: int | None = None,
+    limit: int = 50,
+    db: Session = Depends(get_read_db),
+):
+    """Tag facet: the most used tags with their post counts."""
+    counts = await run_blocking(
+        tag_counts, db, account_id=account_id, limit=max(min(limit, 500), 1)
+    )
+    return [TagCount(tag=tag, count=count) for tag, count in counts]
+
+
+@router.get("/search", response_model=list[SearchHitOut])
+async def search_posts_api(
+    q: str,
+    account_id: int | None = None,
+    status: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    db: Session = Depends(get_read_db),
+):
+    """Relevance-ranked full-text search (FTS5 syntax, ``term*`` for prefixes).
+
+    ``snippet`` / ``job_name_highlight`` are HTML-escaped with matches in ``<mark>``.
+    """
+    try:
+        hits = await run_blocking(
+            search_posts,
+            db,
+            q,
+            account_id=account_id,
+            status=status,
+            limit=max(min(limit, 200), 1),
+            offset=max(offset, 0),
         )
-        await request.app.state.broadcaster.publish(event)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return [
+        SearchHitOut(
+            **PostOut.model_validate(hit.post).model_dump(),
+            rank=hit.rank,
+            snippet=hit.snippet,
+            job_name_highlight=hit.job_name_highlight,
+        )
+        for hit in hits
+    ]
+
 
-    background.add_task(_publish)
+@router.get("/{post_id}", response_model=PostOut)
+async def get_post_api(
+    post_id: int,
+    db: Session = Depends(get_read_db),
+):
+    """One post in full, for expanding a card or summary row on demand."""
+    post = await run_blocking(get_post, db, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
     return post
 
 
@@ -63,38 +176,74 @@ async def update_post_api(
     payload: PostUpdate,
     db: Session = Depends(get_db),
 ):
-    post = get_post(db, post_id)
+    post = await run_blocking(get_post, db, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     update_data = payload.model_dump(exclude_unset=True)
     if "raw_payload_json" in update_data:
-        update_data["raw_payload_json"] = _normalize_raw_payload(
-            update_data["raw_payload_json"]
-        )
+        update_data["raw_payload_json"] = _normalize_raw_payload(update_data["raw_payload_json"])
     for key, value in update_data.items():
         setattr(post, key, value)
-    return update_post(db, post)
+    return await run_blocking(update_post, db, post)
 
 
 @router.get("", response_model=list[PostOut])
 async def list_posts_api(
+    request: Request,
     account_id: int | None = None,
     status: str | None = None,
-    tag: str | None = None,
+    tag: list[str] | None = Query(None),
+    tag_mode: Literal["any", "all"] = "any",
     since: datetime | None = None,
     limit: int = 50,
     q: str | None = None,
-    db: Session = Depends(get_db),
+    before: str | None = None,
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
 ):
-    return list_posts(
+    """List posts newest first.
+
+    ``before``/``after`` take the ``X-Next-Cursor``/``X-Prev-Cursor`` response headers of
+    a previous page (``<created_at>,<id>``) for stable keyset pagination. ``tag`` may be
+    repeated; ``tag_mode=all`` requires every tag instead of any of them. Responses
+    carry an ``ETag``; a matching ``If-None-Match`` gets a 304 without a query.
+
+    Rows are selected as plain columns and encoded with orjson, skipping ORM objects
+    and ``response_model`` validation; the body has the ``PostOut`` schema. With
+    ``Accept: application/x-ndjson`` the same objects are streamed one per line.
+    """
+    ndjson = _accepts_ndjson(request.headers.get("accept"))
+    cached, validators = not_modified(request, variant="ndjson" if ndjson else None, vary="Accept")
+    if cached is not None:
+        return cached
+    try:
+        before_key = decode_cursor(before) if before else None
+        after_key = decode_cursor(after) if after else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    posts = await run_blocking(
+        list_posts,
         db,
         account_id=account_id,
         status=status,
-        tag=tag,
+        tags=tag,
+        tag_mode=tag_mode,
         since=since,
         limit=limit,
         q=q,
+        before=before_key,
+        after=after_key,
+        view="rows",
     )
+    headers = dict(validators)
+    if posts:
+        headers["X-Next-Cursor"] = encode_cursor(posts[-1])
+        headers["X-Prev-Cursor"] = encode_cursor(posts[0])
+    if ndjson:
+        return StreamingResponse(
+            _ndjson_lines(posts), media_type="application/x-ndjson", headers=headers
+        )
+    return ORJSONResponse([_post_json(post) for post in posts], headers=headers)
 
 
 @router.delete("/{post_id}")
@@ -102,8 +251,8 @@ async def delete_post_api(
     post_id: int,
     db: Session = Depends(get_db),
 ):
-    post = get_post(db, post_id)
+    post = await run_blocking(get_post, db, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    delete_post(db, post)
+    await run_blocking(delete_post, db, post)
     return {"status": "deleted", "post_id": post_id}
@@ -1,15 +1,32 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import run_blocking
 from app.core.config import POST_HUMAN_TEXT_MAX_CHARS
 from app.db.session import get_db
-from app.schemas.post import PostOut
-from app.services.system_posts import create_system_post
+from app.schemas.post import BulkIngestOut, PostOut
+from app.services import hot_window
+from app.services.bulk_ingest import (
+    BulkBodyTooLarge,
+    ingest_bulk,
+    is_ndjson,
+    iter_bulk_items,
+)
+from app.services.post_fragments import post_card_cache
+from app.services.queue_watch import watch_stats
+from app.services.system_posts import (
+    create_system_post,
+    system_account_id,
+    system_post_values,
+)
+from app.services.ws_channel import ws_stats
+from app.services.wsl_queue import import_stats
 
 router = APIRouter(prefix="/api/agents/system", tags=["System"])
 
@@ -36,8 +53,17 @@ class SystemProgressIn(BaseModel):
 
 
 @router.post("/progress", response_model=PostOut)
-async def post_progress(payload: SystemProgressIn, db: Session = Depends(get_db)):
-    return create_system_post(
+async def post_progress(payload: SystemProgressIn, request: Request, db: Session = Depends(get_db)):
+    writer = request.app.state.group_commit
+    if writer is not None:
+        account_id = await run_blocking(system_account_id, db)
+        # The writer task needs the single write connection this session may hold.
+        db.close()
+        return await writer.submit(
+            {"account_id": account_id, **system_post_values(**payload.model_dump())}
+        )
+    return await run_blocking(
+        create_system_post,
         db,
         status=payload.status,
         job_name=payload.job_name,
@@ -58,3 +84,51 @@ async def post_progress(payload: SystemProgressIn, db: Session = Depends(get_db)
         tags_csv=payload.tags_csv,
         raw_payload=payload.raw_payload,
     )
+
+
+@router.post("/progress/bulk", response_model=BulkIngestOut)
+async def post_progress_bulk(request: Request, db: Session = Depends(get_db)):
+    """Ingest a JSON array or an NDJSON stream of progress posts."""
+    account_id = await run_blocking(system_account_id, db)
+
+    def build_row(item: Any) -> dict[str, Any]:
+        payload = SystemProgressIn.model_validate(item)
+        return {"account_id": account_id, **system_post_values(**payload.model_dump())}
+
+    items = iter_bulk_items(request.stream(), ndjson=is_ndjson(request.headers.get("content-type")))
+    try:
+        return await ingest_bulk(db, items, build_row)
+    except BulkBodyTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _event_bus_metrics(bus: Any) -> dict[str, Any] | None:
+    if bus is None:
+        return None
+    stats = getattr(bus, "stats", None)
+    return {"backend": type(bus).__name__, **(stats.as_dict() if stats else {})}
+
+
+@router.get("/metrics")
+async def system_metrics(request: Request) -> dict[str, Any]:
+    writer = request.app.state.group_commit
+    return {
+        "group_commit": (
+            {
+                "max_batch": writer.max_batch,
+                "max_delay_ms": writer.max_delay * 1000,
+                **writer.stats.as_dict(),
+            }
+            if writer is not None
+            else None
+        ),
+        "wsl_queue": {**import_stats.as_dict(), "watch": watch_stats.as_dict()},
+        "broadcast": request.app.state.broadcaster.stats(),
+        "connections": request.app.state.connections.stats(),
+        "fragment_cache": post_card_cache.info(),
+        "hot_window": hot_window.info(),
+        "event_bus": _event_bus_metrics(request.app.state.event_bus),
+        "websocket": ws_stats.as_dict(),
+    }
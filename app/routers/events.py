@@ -1,34 +1,98 @@
 from __future__ import annotations
 
-import asyncio
-from datetime import datetime
-
-import orjson
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request, WebSocket
 from fastapi.responses import StreamingResponse
 
+from app.core.config import (
+    SSE_COALESCE_MS,
+    WS_ACK_WINDOW,
+    WS_BATCH_MS,
+    WS_MAX_BATCH,
+    WS_QUEUE_MAX,
+)
+from app.services.broadcast import EventFilter, sse_frame
+from app.services.connections import ConnectionLimitReached
+from app.services.ws_channel import WsChannel
+
 router = APIRouter(prefix="/api/agents", tags=["events"])
 
 
+def _last_event_id(request: Request, last_event_id: str | None) -> int | None:
+    # Browsers resend the header on automatic reconnects; the query parameter covers
+    # clients that open a fresh EventSource.
+    value = request.headers.get("last-event-id") or last_event_id
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
 @router.get("/events")
-async def events(request: Request):
-    broadcaster = request.app.state.broadcaster
-    queue = broadcaster.subscribe()
+async def events(
+    request: Request,
+    last_event_id: str | None = None,
+    account_id: int | None = None,
+    status: str | None = None,
+    tag: str | None = None,
+    job_name: str | None = None,
+    fragments: bool = False,
+):
+    """SSE stream. ``account_id``/``status``/``tag``/``job_name`` narrow post events
+    server-side; control events such as ``resync`` are always delivered.
+
+    With ``fragments=1`` the stream also carries ``post_card`` events: the rendered
+    card HTML plus ``swap`` (``prepend``/``replace``/``remove``) for the client to apply.
+    """
+    manager = request.app.state.connections
+    try:
+        connection = manager.open(
+            last_event_id=_last_event_id(request, last_event_id),
+            event_filter=EventFilter(
+                account_id=account_id, status=status, tag=tag, job_name=job_name
+            ),
+            fragments=fragments,
+        )
+    except ConnectionLimitReached as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+    subscription = connection.subscription
+    window = SSE_COALESCE_MS / 1000
 
     async def event_stream():
+        # No per-connection timers or disconnect polling: the manager's shared tick
+        # queues heartbeats, and a write to a client that left fails and ends the stream.
         try:
             while True:
-                if await request.is_disconnected():
+                batch = await subscription.get_many(window=window)
+                if batch is None:
+                    # Closed by the overflow policy; the browser reconnects.
                     break
-                try:
-                    payload = await asyncio.wait_for(queue.get(), timeout=15)
-                    data = orjson.dumps(payload.data).decode("utf-8")
-                    yield f"event: {payload.event}\n"
-                    yield f"data: {data}\n\n"
-                except asyncio.TimeoutError:
-                    yield "event: heartbeat\n"
-                    yield f"data: {datetime.utcnow().isoformat()}\n\n"
+                # Frames are pre-encoded; one write per batch.
+                data = b"".join(sse_frame(payload) for payload in batch)
+                connection.sent(batch, len(data))
+                yield data
         finally:
-            broadcaster.unsubscribe(queue)
+            manager.close(connection)
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.websocket("/ws")
+async def events_ws(websocket: WebSocket):
+    """Binary event channel for tooling.
+
+    Client messages are JSON (text or binary): ``{"op": "subscribe", "filter": {...},
+    "last_event_id": n, "fragments": false}`` (may be repeated to change the filter) and
+    ``{"op": "ack", "id": n}``. Server frames are orjson bytes: ``subscribed``,
+    ``error`` and ``events`` (``{"type": "events", "last_id": n, "events": [...]}``).
+    Acknowledge ``last_id`` to keep frames flowing.
+    """
+    await websocket.accept()
+    channel = WsChannel(
+        websocket,
+        websocket.app.state.broadcaster,
+        max_queue=WS_QUEUE_MAX,
+        max_batch=WS_MAX_BATCH,
+        batch_window=WS_BATCH_MS / 1000,
+        ack_window=WS_ACK_WINDOW,
+    )
+    await channel.run()
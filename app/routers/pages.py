@@ -1,49 +1,201 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
+from typing import NamedTuple
 
-from fastapi import APIRouter, Depends, Form, Request
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.config import POST_HUMAN_TEXT_MAX_CHARS
-from app.db.session import get_db
+from app.core.concurrency import run_blocking
+from app.core.conditional import not_modified
+from app.core.config import (
+    HTML_STREAM_CHUNK_POSTS,
+    HTML_STREAM_MIN_LIMIT,
+    POST_HUMAN_TEXT_MAX_CHARS,
+)
+from app.core.templating import templates
+from app.db.session import get_db, get_read_db
 from app.models.account import Account
 from app.models.post import Post, PostStatus
-from app.services.accounts import list_accounts, upsert_account
-from app.services.posts import create_post, delete_post, get_post, list_posts
+from app.services.account_cache import (
+    AccountSnapshot,
+    cached_account,
+    cached_accounts,
+    cached_accounts_by_id,
+)
+from app.services.accounts import upsert_account
+from app.services.post_fragments import cached_post_card
+from app.services.post_rows import PostSummary
+from app.services.posts import (
+    create_post,
+    decode_cursor,
+    delete_post,
+    encode_cursor,
+    get_post,
+    iter_post_summaries,
+    list_posts,
+)
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory="app/templates")
-
 
 def _is_hx(request: Request) -> bool:
     return request.headers.get("HX-Request") == "true"
 
 
+async def _render(name: str, context: dict) -> HTMLResponse:
+    # Jinja rendering (and lazy relationship loads inside templates) runs off the loop.
+    return await run_blocking(templates.TemplateResponse, name, context)
+
+
+_STREAM_FLUSH_CHARS = 16 * 1024
+
+
+def _next_html_chunk(pieces: Iterator[str]) -> bytes:
+    buffer: list[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= _STREAM_FLUSH_CHARS:
+            break
+    return "".join(buffer).encode("utf-8")
+
+
+def _stream(
+    name: str, context: dict, db: Session, headers: dict[str, str] | None = None
+) -> StreamingResponse:
+    """Render with ``Template.generate`` and send ~16 KiB at a time.
+
+    Each chunk is rendered off the loop; post bodies are loaded as the template
+    reaches them (``_paginate_posts(stream=True)``), so memory follows the chunk size
+    rather than the page size.
+    """
+    template = templates.get_template(name)
+
+    async def body():
+        try:
+            pieces = template.generate(context)
+            while chunk := await run_blocking(_next_html_chunk, pieces):
+                yield chunk
+        finally:
+            # The get_read_db teardown may already have run; the chunk loads above
+            # reopened the session, so release its connection here.
+            await run_blocking(db.close)
+
+    return StreamingResponse(body(), media_type="text/html", headers=headers)
+
+
+async def _respond(
+    name: str,
+    context: dict,
+    db: Session,
+    *,
+    stream: bool,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    if stream:
+        return _stream(name, context, db, headers)
+    response = await _render(name, context)
+    if headers:
+        response.headers.update(headers)
+    return response
+
+
 def _now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+class TimelinePage(NamedTuple):
+    # A lazy iterator when the page is streamed (see ``_paginate_posts``).
+    posts: Iterable[PostSummary]
+    has_next: bool
+    has_prev: bool
+    page: int
+    limit: int
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def _parse_cursor(value: str | None):
+    if not value:
+        return None
+    try:
+        return decode_cursor(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
 def _paginate_posts(
-    db: Session, page: int, limit: int, account_id: int | None = None
-) -> tuple[list[Post], bool, int, int]:
+    db: Session,
+    page: int,
+    limit: int,
+    account_id: int | None = None,
+    *,
+    before: str | None = None,
+    after: str | None = None,
+    stream: bool = False,
+) -> TimelinePage:
+    """One timeline page. Cursors (``before``/``after``) take precedence over ``page``,
+    which is then only the label shown in the pager.
+
+    Cards need ``PostSummary`` rows only. With ``stream`` just the page's keys are
+    queried up front (enough for the pager); ``posts`` is then an iterator loading the
+    summaries chunk by chunk during rendering.
+    """
     safe_page = max(page, 1)
     safe_limit = max(min(limit, 200), 1)
-    offset = (safe_page - 1) * safe_limit
-    posts = list_posts(
-        db, limit=safe_limit + 1, offset=offset, account_id=account_id
+    before_key = _parse_cursor(before)
+    after_key = _parse_cursor(after)
+    if after_key is not None and before_key is None:
+        posts = list_posts(
+            db,
+            limit=safe_limit + 1,
+            account_id=account_id,
+            after=after_key,
+            view="keys" if stream else "summary",
+        )
+        has_prev = len(posts) > safe_limit
+        posts = posts[-safe_limit:]
+        has_next = True
+        if not has_prev:
+            safe_page = 1
+    else:
+        offset = 0 if before_key is not None else (safe_page - 1) * safe_limit
+        posts = list_posts(
+            db,
+            limit=safe_limit + 1,
+            offset=offset,
+            account_id=account_id,
+            before=before_key,
+            view="keys" if stream else "summary",
+        )
+        has_next = len(posts) > safe_limit
+        posts = posts[:safe_limit]
+        has_prev = safe_page > 1
+    return TimelinePage(
+        posts=(
+            iter_post_summaries(db, posts, chunk_size=HTML_STREAM_CHUNK_POSTS) if stream else posts
+        ),
+        has_next=has_next and bool(posts),
+        has_prev=has_prev and bool(posts),
+        page=safe_page,
+        limit=safe_limit,
+        next_cursor=encode_cursor(posts[-1]) if posts else None,
+        prev_cursor=encode_cursor(posts[0]) if posts else None,
     )
-    has_next = len(posts) > safe_limit
-    return posts[:safe_limit], has_next, safe_page, safe_limit
+
+
+def _streams(limit: int) -> bool:
+    return 0 < HTML_STREAM_MIN_LIMIT <= limit
 
 
 def _timeline_heading(db: Session, account_id: int | None) -> tuple[str, str]:
     if account_id is None:
         return "Timeline", "Latest first"
-    account = db.get(Account, account_id)
+    account = cached_account(db, account_id)
     if not account:
         return "Timeline", "Latest first"
     return f"{account.name} Timeline", "Account posts"
@@ -51,20 +203,24 @@ def _timeline_heading(db: Session, account_id: int | None) -> tuple[str, str]:
 
 def _timeline_context(
     request: Request,
-    posts: list[Post],
+    timeline: TimelinePage,
     *,
-    page: int,
-    limit: int,
-    has_next: bool,
+    accounts_by_id: dict[int, AccountSnapshot],
     account_id: int | None = None,
 ) -> dict:
     return {
         "request": request,
-        "posts": posts,
+        "posts": timeline.posts,
+        "accounts_by_id": accounts_by_id,
+        # Cards come from the fragment cache; the page template only joins them.
+        "post_card_html": cached_post_card,
         "last_seen": _now_iso(),
-        "page": page,
-        "limit": limit,
-        "has_next": has_next,
+        "page": timeline.page,
+        "limit": timeline.limit,
+        "has_next": timeline.has_next,
+        "has_prev": timeline.has_prev,
+        "next_cursor": timeline.next_cursor,
+        "prev_cursor": timeline.prev_cursor,
         "account_id": account_id,
     }
 
@@ -72,7 +228,7 @@ def _timeline_context(
 def _shell_context(
     request: Request,
     *,
-    accounts: list[Account],
+    accounts: list[AccountSnapshot],
     content_template: str,
     title: str = "Timeline",
     subtitle: str = "Latest first",
@@ -93,31 +249,33 @@ async def agents_home(
     request: Request,
     page: int = 1,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    before: str | None = None,
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
 ):
-    accounts = list_accounts(db)
-    posts, has_next, safe_page, safe_limit = _paginate_posts(db, page, limit)
-    title, subtitle = _timeline_heading(db, account_id=None)
+    accounts = await run_blocking(cached_accounts, db)
+    stream = _streams(limit)
+    timeline = await run_blocking(
+        _paginate_posts, db, page, limit, before=before, after=after, stream=stream
+    )
+    title, subtitle = await run_blocking(_timeline_heading, db, account_id=None)
     context = {
         **_shell_context(
             request,
             accounts=accounts,
             title=title,
             subtitle=subtitle,
-            limit=safe_limit,
+            limit=timeline.limit,
             content_template="partials/page_timeline.html",
         ),
         **_timeline_context(
             request,
-            posts,
-            page=safe_page,
-            limit=safe_limit,
-            has_next=has_next,
+            timeline,
+            accounts_by_id=await run_blocking(cached_accounts_by_id, db),
         ),
     }
-    if _is_hx(request):
-        return templates.TemplateResponse("partials/page_timeline.html", context)
-    return templates.TemplateResponse("index.html", context)
+    name = "partials/page_timeline.html" if _is_hx(request) else "index.html"
+    return await _respond(name, context, db, stream=stream)
 
 
 @router.get("/AGENTS/accounts", response_class=HTMLResponse)
@@ -127,9 +285,9 @@ async def agents_home(
 async def pages_dispatch(
     request: Request,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    accounts = list_accounts(db)
+    accounts = await run_blocking(cached_accounts, db)
     path = request.url.path
     template_map = {
         "/AGENTS/accounts": "partials/page_accounts.html",
@@ -145,8 +303,8 @@ async def pages_dispatch(
         limit=limit,
     )
     if _is_hx(request):
-        return templates.TemplateResponse(content_template, context)
-    return templates.TemplateResponse("index.html", context)
+        return await _render(content_template, context)
+    return await _render("index.html", context)
 
 
 @router.get("/AGENTS/account/{account_id}", response_class=HTMLResponse)
@@ -155,17 +313,25 @@ async def account_posts_page(
     account_id: int,
     page: int = 1,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    before: str | None = None,
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
 ):
-    accounts = list_accounts(db)
-    account = db.get(Account, account_id)
+    accounts = await run_blocking(cached_accounts, db)
+    account = await run_blocking(cached_account, db, account_id)
     if not account:
-        return templates.TemplateResponse(
-            "partials/page_settings.html", {"request": request}
-        )
-
-    posts, has_next, safe_page, safe_limit = _paginate_posts(
-        db, page, limit, account_id=account_id
+        return await _render("partials/page_settings.html", {"request": request})
+
+    stream = _streams(limit)
+    timeline = await run_blocking(
+        _paginate_posts,
+        db,
+        page,
+        limit,
+        account_id=account_id,
+        before=before,
+        after=after,
+        stream=stream,
     )
     context = {
         **_shell_context(
@@ -173,22 +339,19 @@ async def account_posts_page(
             accounts=accounts,
             title=f"{account.name} Timeline",
             subtitle="Account posts",
-            limit=safe_limit,
+            limit=timeline.limit,
             content_template="partials/page_account_posts.html",
         ),
         **_timeline_context(
             request,
-            posts,
-            page=safe_page,
-            limit=safe_limit,
-            has_next=has_next,
+            timeline,
+            accounts_by_id=await run_blocking(cached_accounts_by_id, db),
             account_id=account_id,
         ),
         "account": account,
     }
-    if _is_hx(request):
-        return templates.TemplateResponse("partials/page_account_posts.html", context)
-    return templates.TemplateResponse("index.html", context)
+    name = "partials/page_account_posts.html" if _is_hx(request) else "index.html"
+    return await _respond(name, context, db, stream=stream)
 
 
 @router.get("/AGENTS/timeline", response_class=HTMLResponse)
@@ -197,30 +360,57 @@ async def timeline_partial(
     request: Request,
     page: int = 1,
     limit: int = 50,
+    before: str | None = None,
+    after: str | None = None,
     account_id: int | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    posts, has_next, safe_page, safe_limit = _paginate_posts(
-        db, page, limit, account_id=account_id
+    cached, validators = not_modified(request)
+    if cached is not None:
+        return cached
+    stream = _streams(limit)
+    timeline = await run_blocking(
+        _paginate_posts,
+        db,
+        page,
+        limit,
+        account_id=account_id,
+        before=before,
+        after=after,
+        stream=stream,
     )
-    title, subtitle = _timeline_heading(db, account_id=account_id)
-    return templates.TemplateResponse(
+    title, subtitle = await run_blocking(_timeline_heading, db, account_id=account_id)
+    return await _respond(
         "partials/timeline.html",
         {
             **_timeline_context(
                 request,
-                posts,
-                page=safe_page,
-                limit=safe_limit,
-                has_next=has_next,
+                timeline,
+                accounts_by_id=await run_blocking(cached_accounts_by_id, db),
                 account_id=account_id,
             ),
             "title": title,
             "subtitle": subtitle,
         },
+        db,
+        stream=stream,
+        headers=validators,
     )
 
 
+@router.get("/partials/posts/{post_id}", response_class=HTMLResponse)
+async def post_detail_partial(
+    request: Request,
+    post_id: int,
+    db: Session = Depends(get_read_db),
+):
+    """Body of a card's "Details" disclosure, loaded when it is first opened."""
+    post = await run_blocking(get_post, db, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return await _render("partials/post_detail.html", {"request": request, "post": post})
+
+
 @router.post("/accounts/create", response_class=HTMLResponse)
 async def create_account_form(
     request: Request,
@@ -229,11 +419,9 @@ async def create_account_form(
     db: Session = Depends(get_db),
 ):
     account = Account(name=name, color=color)
-    upsert_account(db, account)
-    accounts = list_accounts(db)
-    return templates.TemplateResponse(
-        "partials/accounts_list.html", {"request": request, "accounts": accounts}
-    )
+    await run_blocking(upsert_account, db, account)
+    accounts = await run_blocking(cached_accounts, db)
+    return await _render("partials/accounts_list.html", {"request": request, "accounts": accounts})
 
 
 @router.post("/accounts/{account_id}", response_class=HTMLResponse)
@@ -244,15 +432,13 @@ async def update_account_form(
     color: str = Form("#4b5563"),
     db: Session = Depends(get_db),
 ):
-    account = db.get(Account, account_id)
+    account = await run_blocking(db.get, Account, account_id)
     if account:
         account.name = name
         account.color = color
-        upsert_account(db, account)
-    accounts = list_accounts(db)
-    return templates.TemplateResponse(
-        "partials/accounts_list.html", {"request": request, "accounts": accounts}
-    )
+        await run_blocking(upsert_account, db, account)
+    accounts = await run_blocking(cached_accounts, db)
+    return await _render("partials/accounts_list.html", {"request": request, "accounts": accounts})
 
 
 @router.post("/posts/create", response_class=HTMLResponse)
@@ -285,19 +471,17 @@ async def create_post_form(
         error_summary=error_summary,
         tags_csv=tags_csv,
     )
-    create_post(db, post)
+    await run_blocking(create_post, db, post)
 
-    posts, has_next, safe_page, safe_limit = _paginate_posts(db, 1, 50)
-    title, subtitle = _timeline_heading(db, account_id=None)
-    return templates.TemplateResponse(
+    timeline = await run_blocking(_paginate_posts, db, 1, 50)
+    title, subtitle = await run_blocking(_timeline_heading, db, account_id=None)
+    return await _render(
         "partials/page_timeline.html",
         {
             **_timeline_context(
                 request,
-                posts,
-                page=safe_page,
-                limit=safe_limit,
-                has_next=has_next,
+                timeline,
+                accounts_by_id=await run_blocking(cached_accounts_by_id, db),
             ),
             "title": title,
             "subtitle": subtitle,
@@ -314,23 +498,22 @@ async def delete_post_form(
     account_id: int | None = None,
     db: Session = Depends(get_db),
 ):
-    post = get_post(db, post_id)
+    post = await run_blocking(get_post, db, post_id)
     if post:
-        delete_post(db, post)
-
-    posts, has_next, safe_page, safe_limit = _paginate_posts(
-        db, page, limit, account_id=account_id
-    )
-    title, subtitle = _timeline_heading(db, account_id=account_id)
-    return templates.TemplateResponse(
+        await run_blocking(delete_post, db, post)
+    if request.headers.get("HX-Target") == f"post-{post_id}":
+        # Card-level delete: the card swaps itself out, no timeline re-render.
+        return HTMLResponse("")
+
+    timeline = await run_blocking(_paginate_posts, db, page, limit, account_id=account_id)
+    title, subtitle = await run_blocking(_timeline_heading, db, account_id=account_id)
+    return await _render(
         "partials/timeline.html",
         {
             **_timeline_context(
                 request,
-                posts,
-                page=safe_page,
-                limit=safe_limit,
-                has_next=has_next,
+                timeline,
+                accounts_by_id=await run_blocking(cached_accounts_by_id, db),
                 account_id=account_id,
             ),
             "title": title,
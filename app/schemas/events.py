@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+
+class WsFilter(BaseModel):
+    account_id: int | None = None
+    status: str | None = None
+    tag: str | None = None
+    job_name: str | None = None
+
+
+class WsSubscribe(BaseModel):
+    """(Re)subscribe; replaces the connection's current filter."""
+
+    op: Literal["subscribe"]
+    filter: WsFilter = Field(default_factory=WsFilter)
+    last_event_id: int | None = None
+    fragments: bool = False
+
+
+class WsAck(BaseModel):
+    """Everything up to and including event ``id`` has been processed."""
+
+    op: Literal["ack"]
+    id: int
+
+
+WsClientMessage = TypeAdapter(Annotated[WsSubscribe | WsAck, Field(discriminator="op")])
@@ -61,7 +61,31 @@ class PostUpdate(BaseModel):
 
 class PostOut(PostBase):
     id: int
+    preview: str = ""
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SearchHitOut(PostOut):
+    rank: float
+    snippet: str
+    job_name_highlight: str
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: int | None = None
+    error: str | None = None
+
+
+class BulkIngestOut(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkItemResult]
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+
+
+@dataclass(frozen=True, slots=True)
+class AccountSnapshot:
+    id: int
+    name: str
+    color: str
+
+
+@dataclass
+class _AccountIndex:
+    ordered: list[AccountSnapshot] = field(default_factory=list)
+    by_id: dict[int, AccountSnapshot] = field(default_factory=dict)
+    id_by_name: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class AccountCacheStats:
+    hits: int = 0
+    loads: int = 0
+    invalidations: int = 0
+
+
+_lock = threading.Lock()
+_generation = 0
+# Keyed by engine so separate databases (e.g. per-test in-memory engines) never mix.
+_indexes: WeakKeyDictionary[Engine, _AccountIndex] = WeakKeyDictionary()
+stats = AccountCacheStats()
+
+
+def _index(db: Session) -> _AccountIndex:
+    bind = db.get_bind()
+    with _lock:
+        index = _indexes.get(bind)
+        generation = _generation
+        if index is not None:
+            stats.hits += 1
+            return index
+
+    rows = db.execute(select(Account.id, Account.name, Account.color).order_by(Account.name)).all()
+    index = _AccountIndex()
+    for row in rows:
+        snapshot = AccountSnapshot(id=row.id, name=row.name, color=row.color)
+        index.ordered.append(snapshot)
+        index.by_id[snapshot.id] = snapshot
+        index.id_by_name[snapshot.name] = snapshot.id
+
+    with _lock:
+        stats.loads += 1
+        # Do not publish a snapshot that raced with a write.
+        if generation == _generation:
+            _indexes[bind] = index
+    return index
+
+
+def cached_accounts(db: Session) -> list[AccountSnapshot]:
+    """Accounts sorted by name, as used by the sidebar and account pages."""
+    return _index(db).ordered
+
+
+def cached_accounts_by_id(db: Session) -> dict[int, AccountSnapshot]:
+    return _index(db).by_id
+
+
+def cached_account(db: Session, account_id: int) -> AccountSnapshot | None:
+    return _index(db).by_id.get(account_id)
+
+
+def cached_account_id(db: Session, name: str) -> int | None:
+    return _index(db).id_by_name.get(name)
+
+
+def invalidate_accounts() -> None:
+    """Drop every cached index; call after any committed account write."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _indexes.clear()
+        stats.invalidations += 1
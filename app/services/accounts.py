@@ -4,8 +4,11 @@ from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
 from app.models.account import Account
-from app.models.post import Post
+from app.models.post import Post, PostTag
 from app.models.scene import Scene
+from app.services import hot_window
+from app.services.account_cache import invalidate_accounts
+from app.services.change_events import emit_account_changed
 from app.services.persistence import save_and_refresh
 
 
@@ -19,16 +22,26 @@ def list_accounts(db: Session) -> list[Account]:
 
 
 def upsert_account(db: Session, account: Account) -> Account:
-    return save_and_refresh(db, account)
+    account = save_and_refresh(db, account)
+    invalidate_accounts()
+    emit_account_changed(account.id, "upserted")
+    return account
 
 
 def delete_account(db: Session, account: Account, cascade: bool = False) -> None:
     # Default behavior keeps posts/scenes and nulls account_id.
     if cascade:
+        account_posts = select(Post.id).where(Post.account_id == account.id)
+        db.execute(delete(PostTag).where(PostTag.post_id.in_(account_posts)))
         db.execute(delete(Post).where(Post.account_id == account.id))
         db.execute(delete(Scene).where(Scene.account_id == account.id))
     else:
         db.execute(update(Post).where(Post.account_id == account.id).values(account_id=None))
         db.execute(update(Scene).where(Scene.account_id == account.id).values(account_id=None))
+    account_id = account.id
     db.delete(account)
     db.commit()
+    hot_window.invalidate(db)
+    invalidate_accounts()
+    # Cascaded posts are not announced one by one; clients refetch on account_changed.
+    emit_account_changed(account_id, "deleted")
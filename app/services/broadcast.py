@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from datetime import datetime
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field, replace
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -10,20 +21,354 @@ class EventPayload:
     event: str
     data: dict
     created_at: datetime
+    # Assigned by Broadcaster.publish_nowait; sent as the SSE ``id:`` field.
+    id: int | None = None
+    # Wire-ready SSE frame, encoded once at publish time and shared by all subscribers.
+    frame: bytes | None = field(default=None, compare=False, repr=False)
+
+
+def encode_sse_frame(payload: EventPayload) -> bytes:
+    head = f"id: {payload.id}\n" if payload.id is not None else ""
+    return f"{head}event: {payload.event}\ndata: ".encode() + orjson.dumps(payload.data) + b"\n\n"
+
+
+def sse_frame(payload: EventPayload) -> bytes:
+    return payload.frame if payload.frame is not None else encode_sse_frame(payload)
+
+
+def _resync_event(reason: str, event_id: int | None) -> EventPayload:
+    """``resync`` carrying the id the client has caught up to once it refetches, so its
+    next reconnect resumes from there instead of hitting the same gap again."""
+    payload = EventPayload(
+        event="resync", data={"reason": reason}, created_at=datetime.now(UTC), id=event_id
+    )
+    return replace(payload, frame=encode_sse_frame(payload))
+
+
+@dataclass(frozen=True, slots=True)
+class EventFilter:
+    """Server-side subscription filter over post event fields (all given keys must match).
+
+    Events without a ``post_id`` (resync, account/scene changes) are never filtered.
+    """
+
+    account_id: int | None = None
+    status: str | None = None
+    tag: str | None = None
+    job_name: str | None = None
+
+    @property
+    def empty(self) -> bool:
+        return all(value is None for value in self.as_dict().values())
+
+    def index_key(self) -> tuple[str, Any]:
+        # The most selective key decides which index bucket the subscriber lives in.
+        for name in ("account_id", "job_name", "tag", "status"):
+            value = getattr(self, name)
+            if value is not None:
+                return name, value
+        raise ValueError("An empty filter has no index key")
+
+    def matches(self, data: dict[str, Any]) -> bool:
+        if "post_id" not in data:
+            return True
+        return (
+            (self.account_id is None or data.get("account_id") == self.account_id)
+            and (self.status is None or data.get("status") == self.status)
+            and (self.job_name is None or data.get("job_name") == self.job_name)
+            and (self.tag is None or self.tag in data.get("tags", ()))
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "account_id": self.account_id,
+            "status": self.status,
+            "tag": self.tag,
+            "job_name": self.job_name,
+        }
+
+
+def _event_index_keys(data: dict[str, Any]) -> list[tuple[str, Any]]:
+    keys: list[tuple[str, Any]] = [
+        ("account_id", data.get("account_id")),
+        ("job_name", data.get("job_name")),
+        ("status", data.get("status")),
+    ]
+    keys.extend(("tag", tag) for tag in data.get("tags", ()))
+    return keys
+
+
+# Heavy events (pre-rendered HTML) that only subscribers in fragment mode receive.
+FRAGMENT_EVENTS = frozenset({"post_card"})
+
+
+class OverflowPolicy(StrEnum):
+    DROP_OLDEST = "drop_oldest"
+    RESYNC = "resync"
+    DISCONNECT = "disconnect"
+
+
+@dataclass
+class SubscriberStats:
+    delivered: int = 0
+    dropped: int = 0
+    resyncs: int = 0
+    max_lag: int = 0
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One client's bounded event queue. Only touched from the event loop."""
+
+    id: int
+    maxsize: int
+    policy: OverflowPolicy
+    filter: EventFilter | None = None
+    fragments: bool = False
+    stats: SubscriberStats = field(default_factory=SubscriberStats)
+    closed: bool = False
+    _items: deque[EventPayload] = field(default_factory=deque)
+    _ready: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def lag(self) -> int:
+        return len(self._items)
+
+    def accepts(self, payload: EventPayload) -> bool:
+        if payload.event in FRAGMENT_EVENTS and not self.fragments:
+            return False
+        return self.filter is None or self.filter.matches(payload.data)
+
+    async def get(self) -> EventPayload | None:
+        """Next event, or ``None`` once the subscription has been closed."""
+        while not self._items:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        self.stats.delivered += 1
+        return self._items.popleft()
+
+    async def get_many(
+        self, *, timeout: float | None = None, window: float = 0.0
+    ) -> list[EventPayload] | None:
+        """Wait up to ``timeout`` for one event, then take everything queued within
+        ``window`` seconds.
+
+        Raises ``TimeoutError`` only from the first wait, so a batch is never lost
+        mid-window. Returns ``None`` once the subscription has been closed and drained.
+        """
+        first = await asyncio.wait_for(self.get(), timeout)
+        if first is None:
+            return None
+        if window > 0 and not self.closed:
+            await asyncio.sleep(window)
+        batch = [first, *self._items]
+        self._items.clear()
+        self.stats.delivered += len(batch) - 1
+        return batch
+
+    def offer(self, payload: EventPayload) -> bool:
+        """Queue ``payload`` without blocking; ``False`` means the subscriber must go."""
+        if self.closed:
+            return False
+        if len(self._items) >= self.maxsize:
+            if self.policy is OverflowPolicy.DISCONNECT:
+                self.stats.dropped += len(self._items) + 1
+                self._items.clear()
+                self.close()
+                return False
+            if self.policy is OverflowPolicy.RESYNC:
+                # Everything queued is stale; tell the client to refetch instead.
+                self.stats.dropped += len(self._items) + 1
+                self.stats.resyncs += 1
+                self._items.clear()
+                payload = _resync_event("overflow", payload.id)
+            else:
+                self.stats.dropped += 1
+                self._items.popleft()
+        self._items.append(payload)
+        self.stats.max_lag = max(self.stats.max_lag, len(self._items))
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "lag": self.lag,
+            "policy": self.policy.value,
+            "filter": self.filter.as_dict() if self.filter else None,
+            "fragments": self.fragments,
+            **asdict(self.stats),
+        }
 
 
 class Broadcaster:
-    def __init__(self) -> None:
-        self._subscribers: set[asyncio.Queue[EventPayload]] = set()
+    """Fan-out of events to SSE subscribers.
+
+    Each subscriber has a bounded queue; ``publish`` never waits on a slow client and
+    applies the subscriber's overflow policy instead.
 
-    def subscribe(self) -> asyncio.Queue[EventPayload]:
-        queue: asyncio.Queue[EventPayload] = asyncio.Queue()
-        self._subscribers.add(queue)
-        return queue
+    Every published event gets an increasing id and is kept in a ring buffer of the
+    last ``history_size`` events, so a reconnecting client (``Last-Event-ID``) gets
+    exactly what it missed. Ids start from the boot time in microseconds, which keeps
+    them increasing across restarts: an id from a previous process is recognised as
+    older than the buffer and answered with a single ``resync`` event.
 
-    def unsubscribe(self, queue: asyncio.Queue[EventPayload]) -> None:
-        self._subscribers.discard(queue)
+    Filtered subscribers are indexed by their most selective filter key, so a post
+    event only visits unfiltered subscribers and the buckets its fields point to.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 256,
+        policy: OverflowPolicy | str = OverflowPolicy.RESYNC,
+        history_size: int = 1024,
+    ) -> None:
+        self.max_queue = max(max_queue, 1)
+        self.policy = OverflowPolicy(policy)
+        self._subscribers: set[Subscription] = set()
+        self._unfiltered: set[Subscription] = set()
+        self._by_key: dict[tuple[str, Any], set[Subscription]] = {}
+        self._fragment_subscribers = 0
+        self._ids = itertools.count(1)
+        self._history: deque[EventPayload] = deque(maxlen=max(history_size, 1))
+        self.first_event_id = time.time_ns() // 1000
+        self.last_event_id = self.first_event_id - 1
+        self.published = 0
+        self.disconnected = 0
+        self.replayed = 0
+        self.resume_resyncs = 0
+
+    def subscribe(
+        self,
+        policy: OverflowPolicy | str | None = None,
+        *,
+        last_event_id: int | None = None,
+        event_filter: EventFilter | None = None,
+        fragments: bool = False,
+        max_queue: int | None = None,
+    ) -> Subscription:
+        subscription = Subscription(
+            id=next(self._ids),
+            maxsize=max(max_queue, 1) if max_queue else self.max_queue,
+            policy=OverflowPolicy(policy) if policy else self.policy,
+            filter=event_filter if event_filter and not event_filter.empty else None,
+            fragments=fragments,
+        )
+        if last_event_id is not None:
+            self._resume(subscription, last_event_id)
+        self._add(subscription)
+        return subscription
+
+    def _add(self, subscription: Subscription) -> None:
+        self._subscribers.add(subscription)
+        self._fragment_subscribers += subscription.fragments
+        if subscription.filter is None:
+            self._unfiltered.add(subscription)
+        else:
+            self._by_key.setdefault(subscription.filter.index_key(), set()).add(subscription)
+
+    def _remove(self, subscription: Subscription) -> None:
+        if subscription not in self._subscribers:
+            return
+        self._subscribers.discard(subscription)
+        self._fragment_subscribers -= subscription.fragments
+        if subscription.filter is None:
+            self._unfiltered.discard(subscription)
+            return
+        key = subscription.filter.index_key()
+        bucket = self._by_key.get(key)
+        if bucket is not None:
+            bucket.discard(subscription)
+            if not bucket:
+                del self._by_key[key]
+
+    @property
+    def fragment_subscribers(self) -> int:
+        """Subscribers that want rendered HTML; publishers skip rendering when zero."""
+        return self._fragment_subscribers
+
+    def _targets(self, payload: EventPayload) -> list[Subscription]:
+        data = payload.data
+        if "post_id" not in data:
+            candidates: Iterable[Subscription] = self._subscribers
+        else:
+            candidates = itertools.chain(
+                self._unfiltered,
+                *(self._by_key.get(key, ()) for key in _event_index_keys(data)),
+            )
+        targets: dict[Subscription, None] = {}
+        for subscription in candidates:
+            if subscription not in targets and subscription.accepts(payload):
+                targets[subscription] = None
+        return list(targets)
+
+    def _resume(self, subscription: Subscription, last_event_id: int) -> None:
+        if last_event_id >= self.last_event_id:
+            return
+        oldest = self._history[0].id if self._history else self.last_event_id + 1
+        missed = []
+        if last_event_id + 1 >= oldest:
+            missed = [
+                payload
+                for payload in self._history
+                if payload.id > last_event_id and subscription.accepts(payload)
+            ]
+        if last_event_id + 1 < oldest or len(missed) > subscription.maxsize:
+            # The gap is no longer (or too large to be) in the buffer.
+            self.resume_resyncs += 1
+            subscription.offer(_resync_event("gap", self.last_event_id))
+            return
+        for payload in missed:
+            subscription.offer(payload)
+            self.replayed += 1
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._remove(subscription)
+        subscription.close()
+
+    def continue_ids_after(self, event_id: int) -> None:
+        """Adopt an external id sequence (the shared ``event_log``); call before publishing."""
+        self.first_event_id = event_id + 1
+        self.last_event_id = event_id
+
+    def publish_nowait(self, payload: EventPayload) -> None:
+        if payload.id is None:
+            self.last_event_id += 1
+            payload = replace(payload, id=self.last_event_id)
+        else:
+            self.last_event_id = payload.id
+        payload = replace(payload, frame=encode_sse_frame(payload))
+        self._history.append(payload)
+        self.published += 1
+        for subscription in self._targets(payload):
+            if not subscription.offer(payload):
+                logger.warning("Disconnecting slow SSE subscriber %s", subscription.id)
+                self.disconnected += 1
+                self._remove(subscription)
 
     async def publish(self, payload: EventPayload) -> None:
-        for queue in list(self._subscribers):
-            await queue.put(payload)
+        # Kept awaitable so BackgroundTasks runs it on the event loop, not a thread.
+        self.publish_nowait(payload)
+
+    def stats(self) -> dict[str, Any]:
+        subscribers = sorted(self._subscribers, key=lambda item: item.id)
+        return {
+            "max_queue": self.max_queue,
+            "policy": self.policy.value,
+            "published": self.published,
+            "disconnected": self.disconnected,
+            "unfiltered": len(self._unfiltered),
+            "filter_buckets": len(self._by_key),
+            "last_event_id": self.last_event_id,
+            "history": len(self._history),
+            "replayed": self.replayed,
+            "resume_resyncs": self.resume_resyncs,
+            "subscribers": [subscription.as_dict() for subscription in subscribers],
+        }
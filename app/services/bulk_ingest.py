@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.concurrency import run_blocking
+from app.core.config import BULK_INSERT_CHUNK_SIZE, BULK_JSON_MAX_BYTES
+from app.services.posts import insert_posts
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class BulkBodyTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class BulkIngestResult:
+    created: int = 0
+    failed: int = 0
+    results: list[dict[str, Any]] = field(default_factory=list)
+
+
+def is_ndjson(content_type: str | None) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES
+
+
+async def iter_bulk_items(body: AsyncIterator[bytes], *, ndjson: bool) -> AsyncIterator[Any]:
+    """Yield raw items from a JSON array body or a streamed NDJSON body.
+
+    NDJSON lines are yielded undecoded (bytes) as they arrive, so a bad line only fails
+    that item. A JSON array is decoded in one piece and therefore buffered whole, up to
+    ``BULK_JSON_MAX_BYTES`` (``BulkBodyTooLarge`` beyond that; stream NDJSON instead).
+    Raises ``ValueError`` when a JSON body is not an array.
+    """
+    if not ndjson:
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in body:
+            size += len(chunk)
+            if size > BULK_JSON_MAX_BYTES:
+                raise BulkBodyTooLarge(
+                    f"JSON array body exceeds {BULK_JSON_MAX_BYTES} bytes; send NDJSON instead"
+                )
+            chunks.append(chunk)
+        items = orjson.loads(b"".join(chunks))
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array of items")
+        for item in items:
+            yield item
+        return
+
+    # Pieces of the line still waiting for its newline; only new chunks are scanned.
+    partial: list[bytes] = []
+    async for chunk in body:
+        *lines, rest = chunk.split(b"\n")
+        if lines:
+            partial.append(lines[0])
+            lines[0] = b"".join(partial)
+            partial.clear()
+            for line in lines:
+                if line.strip():
+                    yield line
+        if rest:
+            partial.append(rest)
+    line = b"".join(partial)
+    if line.strip():
+        yield line
+
+
+def _format_error(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+            for err in exc.errors(include_url=False)
+        )
+    return str(exc) or exc.__class__.__name__
+
+
+def _insert_chunk(db: Session, rows: list[dict[str, Any]]) -> list[int]:
+    try:
+        return insert_posts(db, rows)
+    finally:
+        # Give the single write connection back while the next chunk is uploading.
+        db.close()
+
+
+async def ingest_bulk(
+    db: Session,
+    items: AsyncIterator[Any],
+    build_row: Callable[[Any], dict[str, Any]],
+    *,
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+) -> BulkIngestResult:
+    """Validate items as they arrive and insert them in chunked transactions.
+
+    ``build_row`` turns one decoded item into ``posts`` column values and may raise
+    to reject it. Each chunk is one executemany + COMMIT; a failed chunk is
+    reported per item and does not affect chunks already committed.
+    """
+    result = BulkIngestResult()
+    pending: list[tuple[int, dict[str, Any]]] = []
+
+    async def flush() -> None:
+        if not pending:
+            return
+        try:
+            ids = await run_blocking(_insert_chunk, db, [row for _, row in pending])
+        except Exception as exc:
+            error = _format_error(exc)
+            result.failed += len(pending)
+            result.results.extend({"index": index, "error": error} for index, _ in pending)
+        else:
+            result.created += len(ids)
+            result.results.extend(
+                {"index": index, "id": post_id}
+                for (index, _), post_id in zip(pending, ids, strict=True)
+            )
+        pending.clear()
+
+    index = 0
+    async for item in items:
+        try:
+            if isinstance(item, bytes):
+                item = orjson.loads(item)
+            pending.append((index, build_row(item)))
+        except Exception as exc:
+            result.failed += 1
+            result.results.append({"index": index, "error": _format_error(exc)})
+        index += 1
+        if len(pending) >= chunk_size:
+            await flush()
+    await flush()
+
+    result.results.sort(key=lambda entry: entry["index"])
+    return result
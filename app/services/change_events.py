@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any, Literal
+
+from sqlalchemy.orm import Session
+
+from app.services import data_version
+from app.services.broadcast import EventPayload
+from app.services.event_bus import EventBus
+from app.services.post_fragments import build_post_card_event, post_event_data
+
+PostChange = Literal["created", "updated", "deleted"]
+_CARD_SWAPS = {"created": "prepend", "updated": "replace", "deleted": "remove"}
+
+# Above this many rows in one bulk insert, subscribers get one resync instead.
+BULK_EVENT_LIMIT = 200
+
+_bus: EventBus | None = None
+
+
+def attach(bus: EventBus) -> None:
+    """Route change events to ``bus`` (called from the lifespan)."""
+    global _bus
+    _bus = bus
+
+
+def detach() -> None:
+    global _bus
+    _bus = None
+
+
+def _event(event: str, data: dict[str, Any]) -> EventPayload:
+    return EventPayload(event=event, data=data, created_at=datetime.now(UTC))
+
+
+def publish(payloads: Sequence[EventPayload]) -> None:
+    """Hand events to the bus. Safe from worker threads; events from one call are
+    published together and in order. Without a running app only the data version
+    moves."""
+    if any(payload.event in data_version.DATA_EVENTS for payload in payloads):
+        # Synchronous, so a read right after this write never gets a stale 304.
+        data_version.bump()
+    bus = _bus
+    if bus is None or not payloads:
+        return
+    bus.publish(payloads)
+
+
+def post_change_events(
+    db: Session, post: Any, change: PostChange, *, card: bool = True
+) -> list[EventPayload]:
+    """``post_<change>`` plus, when fragment subscribers exist, its ``post_card``.
+
+    Build these before deleting ``post``; they snapshot its fields.
+    """
+    payloads: list[EventPayload] = []
+    bus = _bus
+    if card and bus is not None and bus.wants_fragments:
+        # The card goes first so clients can skip the refetch post_* would imply.
+        payloads.append(build_post_card_event(db, post, _CARD_SWAPS[change]))
+    payloads.append(_event(f"post_{change}", post_event_data(post)))
+    return payloads
+
+
+def emit_post_change(db: Session, post: Any, change: PostChange) -> None:
+    publish(post_change_events(db, post, change))
+
+
+def emit_rows_created(db: Session, rows: Iterable[dict[str, Any]], *, cards: bool = True) -> None:
+    """Events for rows written with Core inserts (each row must include ``id``).
+
+    Pass ``cards=False`` when rows lack server-generated columns such as
+    ``created_at``; clients then refetch instead of inserting a card.
+    """
+    rows = list(rows)
+    if len(rows) > BULK_EVENT_LIMIT:
+        publish([_event("resync", {"reason": "bulk", "count": len(rows)})])
+        return
+    payloads: list[EventPayload] = []
+    for row in rows:
+        payloads.extend(post_change_events(db, SimpleNamespace(**row), "created", card=cards))
+    publish(payloads)
+
+
+def emit_account_changed(account_id: int, action: str) -> None:
+    publish([_event("account_changed", {"account_id": account_id, "action": action})])
+
+
+def emit_scene_changed(scene_id: int, action: str) -> None:
+    publish([_event("scene_changed", {"scene_id": scene_id, "action": action})])
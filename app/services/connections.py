@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from app.services.broadcast import Broadcaster, EventPayload, Subscription
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionLimitReached(RuntimeError):
+    pass
+
+
+@dataclass(eq=False)
+class SseConnection:
+    """Book-keeping for one open SSE stream."""
+
+    id: int
+    subscription: Subscription
+    opened_at: float = field(default_factory=time.monotonic)
+    last_send: float = field(default_factory=time.monotonic)
+    frames: int = 0
+    bytes_sent: int = 0
+    heartbeats: int = 0
+    # Age of the oldest event in the last write: queueing plus coalescing delay.
+    send_lag_ms: float = 0.0
+    max_send_lag_ms: float = 0.0
+
+    def sent(self, batch: Sequence[EventPayload], size: int) -> None:
+        now = time.monotonic()
+        self.last_send = now
+        self.frames += 1
+        self.bytes_sent += size
+        oldest = next((payload for payload in batch if payload.event != "heartbeat"), None)
+        if oldest is None:
+            self.heartbeats += 1
+            return
+        lag = (datetime.now(UTC) - oldest.created_at).total_seconds() * 1000
+        self.send_lag_ms = round(max(lag, 0.0), 2)
+        self.max_send_lag_ms = max(self.max_send_lag_ms, self.send_lag_ms)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "subscription": self.subscription.id,
+            "age_s": round(now - self.opened_at, 1),
+            "idle_s": round(now - self.last_send, 1),
+            "queue_lag": self.subscription.lag,
+            "frames": self.frames,
+            "bytes_sent": self.bytes_sent,
+            "heartbeats": self.heartbeats,
+            "send_lag_ms": self.send_lag_ms,
+            "max_send_lag_ms": self.max_send_lag_ms,
+        }
+
+
+class ConnectionManager:
+    """Admission control and keep-alive for SSE streams.
+
+    One ticker task wakes every ``heartbeat_s`` seconds, formats a single heartbeat
+    frame and queues it for connections that have been idle (nothing written, nothing
+    queued) for at least half an interval, so streams need no per-connection timers.
+    A client that went away is noticed when a write to it fails, which the heartbeat
+    guarantees happens within one interval.
+    """
+
+    def __init__(
+        self,
+        broadcaster: Broadcaster,
+        *,
+        max_connections: int = 1000,
+        heartbeat_s: float = 15.0,
+    ) -> None:
+        self.broadcaster = broadcaster
+        self.max_connections = max(max_connections, 1)
+        self.heartbeat_s = max(heartbeat_s, 0.1)
+        self._connections: set[SseConnection] = set()
+        self._ids = itertools.count(1)
+        self._task: asyncio.Task[None] | None = None
+        self.opened = 0
+        self.rejected = 0
+        self.ticks = 0
+
+    @property
+    def active(self) -> int:
+        return len(self._connections)
+
+    def open(self, **subscribe_kwargs: Any) -> SseConnection:
+        """Subscribe a new stream; raises ``ConnectionLimitReached`` when full."""
+        if len(self._connections) >= self.max_connections:
+            self.rejected += 1
+            raise ConnectionLimitReached(f"SSE connection limit reached ({self.max_connections})")
+        connection = SseConnection(
+            id=next(self._ids),
+            subscription=self.broadcaster.subscribe(**subscribe_kwargs),
+        )
+        self._connections.add(connection)
+        self.opened += 1
+        return connection
+
+    def close(self, connection: SseConnection) -> None:
+        self._connections.discard(connection)
+        self.broadcaster.unsubscribe(connection.subscription)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._ticker())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def tick(self) -> int:
+        """Queue one shared heartbeat for idle connections; returns how many got it."""
+        self.ticks += 1
+        now = time.monotonic()
+        stamp = datetime.now(UTC)
+        heartbeat = EventPayload(
+            event="heartbeat",
+            data={},
+            created_at=stamp,
+            frame=f"event: heartbeat\ndata: {stamp.isoformat()}\n\n".encode(),
+        )
+        sent = 0
+        for connection in self._connections:
+            subscription = connection.subscription
+            if subscription.lag or now - connection.last_send < self.heartbeat_s / 2:
+                continue
+            if subscription.offer(heartbeat):
+                sent += 1
+        return sent
+
+    async def _ticker(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_s)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("SSE heartbeat tick failed")
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        connections = sorted(self._connections, key=lambda item: item.id)
+        return {
+            "active": len(connections),
+            "max_connections": self.max_connections,
+            "heartbeat_s": self.heartbeat_s,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "ticks": self.ticks,
+            "max_send_lag_ms": max(
+                (connection.max_send_lag_ms for connection in connections), default=0.0
+            ),
+            "connections": [connection.as_dict(now) for connection in connections],
+        }
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+
+class DataVersion(NamedTuple):
+    version: int
+    modified_at: datetime
+    etag: str
+
+
+# Change events that alter what timeline/API reads return (scene edits do not).
+DATA_EVENTS = frozenset(
+    {"post_created", "post_updated", "post_deleted", "account_changed", "resync"}
+)
+
+_lock = threading.Lock()
+# Counters restart with the process (and differ between workers), so the epoch is part
+# of the ETag: a validator from another process never matches, it just misses.
+_epoch = format(time.time_ns() // 1000, "x")
+_version = 0
+_modified_at = datetime.now(UTC)
+
+
+def _etag(version: int) -> str:
+    return f'W/"{_epoch}-{version}"'
+
+
+def bump() -> int:
+    """Mark that posts/accounts changed. Cheap; called after every committed write."""
+    global _version, _modified_at
+    with _lock:
+        _version += 1
+        _modified_at = datetime.now(UTC)
+        return _version
+
+
+def current() -> DataVersion:
+    with _lock:
+        return DataVersion(_version, _modified_at, _etag(_version))
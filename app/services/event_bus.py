@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from datetime import UTC, timedelta
+from typing import Any, Protocol
+
+import orjson
+from sqlalchemy import Engine, delete, func, insert, select
+
+from app.core.concurrency import run_blocking
+from app.models.base import utcnow
+from app.models.event_log import EventLog
+from app.services import data_version, hot_window
+from app.services.account_cache import invalidate_accounts
+from app.services.broadcast import Broadcaster, EventPayload
+
+logger = logging.getLogger(__name__)
+
+_TAIL_BATCH = 500
+
+
+class EventBus(Protocol):
+    """Where service-layer change events go. ``publish`` may be called from any thread."""
+
+    @property
+    def wants_fragments(self) -> bool: ...
+
+    def publish(self, payloads: Sequence[EventPayload]) -> None: ...
+
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class MemoryEventBus:
+    """Single-process fan-out straight into this process's broadcaster (the default).
+
+    Enables the hot window while running: with one worker every write goes through this
+    process. Several workers on this bus need ``AGENTS_HOT_WINDOW_SIZE=0``.
+    """
+
+    def __init__(self, broadcaster: Broadcaster, loop: asyncio.AbstractEventLoop) -> None:
+        self.broadcaster = broadcaster
+        self.loop = loop
+
+    @property
+    def wants_fragments(self) -> bool:
+        return self.broadcaster.fragment_subscribers > 0
+
+    def publish(self, payloads: Sequence[EventPayload]) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, list(payloads))
+        except RuntimeError:
+            # Loop already closed (shutdown); nobody is listening anymore.
+            logger.debug("Dropping %d change events after loop shutdown", len(payloads))
+
+    def _deliver(self, payloads: list[EventPayload]) -> None:
+        for payload in payloads:
+            self.broadcaster.publish_nowait(payload)
+
+    async def start(self) -> None:
+        hot_window.enable()
+
+    async def stop(self) -> None:
+        hot_window.disable()
+
+
+@dataclass
+class SqliteBusStats:
+    queued: int = 0
+    written: int = 0
+    write_errors: int = 0
+    tailed: int = 0
+    polls: int = 0
+    pruned: int = 0
+    last_id: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SqliteEventBus:
+    """Cross-process fan-out through the ``event_log`` table.
+
+    Every worker appends its events to the table and tails it (its own rows included),
+    so all workers deliver the same events in the same order with the same ids. Rows
+    carry the writer's pid: caches are only invalidated for other workers' writes,
+    since a worker's own writes already updated them in-line. Old rows are pruned
+    after ``retention_s``.
+
+    While the bus runs, this worker's hot window is enabled: the tail is what tells it
+    about other workers' writes.
+
+    ``publish`` runs right after a service-layer COMMIT, often on a thread whose session
+    still holds the single write connection, so rows are appended from the bus's own
+    task rather than inline (inline only before ``start`` / after ``stop``).
+    """
+
+    def __init__(
+        self,
+        broadcaster: Broadcaster,
+        *,
+        write_engine: Engine,
+        read_engine: Engine,
+        poll_ms: int = 100,
+        retention_s: int = 600,
+    ) -> None:
+        self.broadcaster = broadcaster
+        self.write_engine = write_engine
+        self.read_engine = read_engine
+        self.poll = max(poll_ms, 10) / 1000
+        self.retention_s = retention_s
+        self.stats = SqliteBusStats()
+        self.origin_pid = os.getpid()
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: asyncio.Queue[list[dict[str, Any]] | None] = asyncio.Queue()
+        self._appender: asyncio.Task[None] | None = None
+        self._last_id = 0
+        self._next_prune = 0.0
+
+    @property
+    def wants_fragments(self) -> bool:
+        # Another worker may have fragment subscribers; render once at the source.
+        return True
+
+    def publish(self, payloads: Sequence[EventPayload]) -> None:
+        if not payloads:
+            return
+        rows = [
+            {
+                "event": payload.event,
+                "data_json": orjson.dumps(payload.data).decode("utf-8"),
+                "origin_pid": self.origin_pid,
+                "created_at": utcnow(),
+            }
+            for payload in payloads
+        ]
+        self.stats.queued += len(rows)
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._pending.put_nowait, rows)
+                return
+            except RuntimeError:
+                pass  # Loop already closed (shutdown): append inline below.
+        self._append(rows)
+
+    def _append(self, rows: list[dict[str, Any]]) -> None:
+        try:
+            with self.write_engine.begin() as conn:
+                conn.execute(insert(EventLog.__table__), rows)
+        except Exception:
+            # The write itself already committed; losing its notification is not fatal.
+            self.stats.write_errors += 1
+            logger.exception("Failed to append %d change events to event_log", len(rows))
+            return
+        self.stats.written += len(rows)
+
+    async def _append_pending(self) -> None:
+        while True:
+            rows = await self._pending.get()
+            if rows is None:
+                return
+            # Coalesce whatever queued up meanwhile into one transaction, in order.
+            stopping = False
+            while not self._pending.empty():
+                more = self._pending.get_nowait()
+                if more is None:
+                    stopping = True
+                    break
+                rows.extend(more)
+            await run_blocking(self._append, rows)
+            if stopping:
+                return
+
+    async def start(self) -> None:
+        self._last_id = await run_blocking(self._max_id)
+        self.stats.last_id = self._last_id
+        self.broadcaster.continue_ids_after(self._last_id)
+        hot_window.enable()
+        self._loop = asyncio.get_running_loop()
+        self._appender = asyncio.create_task(self._append_pending())
+        self._task = asyncio.create_task(self._tail())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        hot_window.disable()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        # Flush what is already queued; later publishes append inline.
+        self._loop = None
+        if self._appender is not None:
+            self._pending.put_nowait(None)
+            await self._appender
+            self._appender = None
+        leftovers: list[dict[str, Any]] = []
+        while not self._pending.empty():
+            leftovers.extend(self._pending.get_nowait() or [])
+        if leftovers:
+            await run_blocking(self._append, leftovers)
+
+    def _max_id(self) -> int:
+        with self.read_engine.connect() as conn:
+            return conn.execute(select(func.max(EventLog.id))).scalar() or 0
+
+    def _fetch(self) -> list[Any]:
+        stmt = (
+            select(
+                EventLog.id,
+                EventLog.event,
+                EventLog.data_json,
+                EventLog.created_at,
+                EventLog.origin_pid,
+            )
+            .where(EventLog.id > self._last_id)
+            .order_by(EventLog.id)
+            .limit(_TAIL_BATCH)
+        )
+        with self.read_engine.connect() as conn:
+            return conn.execute(stmt).all()
+
+    def _prune(self) -> int:
+        cutoff = utcnow() - timedelta(seconds=self.retention_s)
+        with self.write_engine.begin() as conn:
+            return conn.execute(delete(EventLog).where(EventLog.created_at < cutoff)).rowcount
+
+    async def _tail(self) -> None:
+        while True:
+            try:
+                rows = await run_blocking(self._fetch)
+                self.stats.polls += 1
+                self._deliver(rows)
+                if time.monotonic() >= self._next_prune:
+                    self._next_prune = time.monotonic() + max(self.retention_s / 10, 1)
+                    self.stats.pruned += await run_blocking(self._prune)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("event_log tail failed; retrying")
+                rows = []
+            if len(rows) < _TAIL_BATCH:
+                await asyncio.sleep(self.poll)
+
+    def _deliver(self, rows: list[Any]) -> None:
+        for row in rows:
+            # The writing worker already invalidated in-line; the others learn it here.
+            foreign = row.origin_pid != self.origin_pid
+            if foreign and row.event == "account_changed":
+                invalidate_accounts()
+            if foreign and row.event in data_version.DATA_EVENTS:
+                data_version.bump()
+                hot_window.invalidate()
+            self.broadcaster.publish_nowait(
+                EventPayload(
+                    event=row.event,
+                    data=orjson.loads(row.data_json),
+                    created_at=row.created_at.replace(tzinfo=UTC),
+                    id=row.id,
+                )
+            )
+            self._last_id = row.id
+        if rows:
+            self.stats.tailed += len(rows)
+            self.stats.last_id = self._last_id
+
+
+def create_event_bus(
+    kind: str,
+    broadcaster: Broadcaster,
+    loop: asyncio.AbstractEventLoop,
+    *,
+    write_engine: Engine,
+    read_engine: Engine,
+    poll_ms: int = 100,
+    retention_s: int = 600,
+) -> EventBus:
+    if kind == "sqlite":
+        return SqliteEventBus(
+            broadcaster,
+            write_engine=write_engine,
+            read_engine=read_engine,
+            poll_ms=poll_ms,
+            retention_s=retention_s,
+        )
+    if kind != "memory":
+        logger.warning("Unknown AGENTS_EVENT_BUS=%r; using the in-memory bus", kind)
+    return MemoryEventBus(broadcaster, loop)
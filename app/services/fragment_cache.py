@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, NamedTuple
+
+
+@dataclass
+class FragmentCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        lookups = self.hits + self.misses
+        data["hit_rate"] = round(self.hits / lookups, 4) if lookups else 0.0
+        return data
+
+
+class _Entry(NamedTuple):
+    version: Hashable
+    html: str
+    size: int
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered HTML fragments, bounded by entries and bytes.
+
+    One entry per ``key`` (a post id); ``version`` (e.g. ``updated_at`` plus the account
+    shown on the card) must match for a hit, so an edited post simply misses and its
+    entry is replaced. Rendering happens outside the lock.
+    """
+
+    def __init__(self, *, max_entries: int = 2000, max_bytes: int = 8 * 1024 * 1024) -> None:
+        self.max_entries = max(max_entries, 0)
+        self.max_bytes = max(max_bytes, 0)
+        self.stats = FragmentCacheStats()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Hashable, version: Hashable, render: Callable[[], str]) -> str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.html
+            self.stats.misses += 1
+        html = render()
+        self._store(key, version, html)
+        return html
+
+    def _store(self, key: Hashable, version: Hashable, html: str) -> None:
+        size = len(html.encode("utf-8"))
+        if not self.max_entries or size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = _Entry(version, html, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.stats.evictions += 1
+
+    def _discard(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if self._discard(key):
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self.stats.as_dict(),
+            }
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.concurrency import run_blocking
+from app.models.post import Post
+from app.services import hot_window
+from app.services.change_events import emit_rows_created
+from app.services.tags import add_post_tags
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class GroupCommitStats:
+    submitted: int = 0
+    committed: int = 0
+    failed: int = 0
+    batches: int = 0
+    max_batch: int = 0
+    fallback_batches: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["avg_batch"] = round(self.committed / self.batches, 2) if self.batches else 0.0
+        return data
+
+
+class GroupCommitWriter:
+    """Single writer task that coalesces concurrent post inserts into one transaction.
+
+    Callers ``await submit(row)`` and get back the inserted row. The writer flushes
+    when ``max_batch`` rows are queued or ``max_delay_ms`` has passed since the first
+    row of the batch arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        max_batch: int = 256,
+        max_delay_ms: float = 5.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max(max_delay_ms, 0.0) / 1000
+        self.stats = GroupCommitStats()
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+        self._db: Session | None = None
+        self._closed = True
+
+    @property
+    def running(self) -> bool:
+        return not self._closed and self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._db = self._session_factory()
+        self._closed = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything already submitted, then release the write connection."""
+        if self._task is None:
+            return
+        # Close first so submit() refuses new rows instead of queueing them behind _STOP.
+        self._closed = True
+        self._queue.put_nowait(_STOP)
+        try:
+            await self._task
+            # Rows that raced in just before the close still get written.
+            leftovers = self._drain()
+            if leftovers:
+                await self._flush(leftovers)
+        finally:
+            self._task = None
+            for _, future in self._drain():
+                if not future.done():
+                    self.stats.failed += 1
+                    future.set_exception(RuntimeError("Group commit writer stopped"))
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _drain(self) -> list[tuple[dict[str, Any], asyncio.Future]]:
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return items
+            if item is not _STOP:
+                items.append(item)
+
+    async def submit(self, row: dict[str, Any]) -> dict[str, Any]:
+        if not self.running:
+            raise RuntimeError("Group commit writer is not running")
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self.stats.submitted += 1
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    # Take whatever is already queued without waiting.
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            outcomes = await run_blocking(self._write, rows)
+        except Exception as exc:
+            logger.exception("Group commit flush failed")
+            outcomes = [exc] * len(batch)
+
+        self.stats.batches += 1
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        for (_, future), outcome in zip(batch, outcomes, strict=True):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                self.stats.failed += 1
+                future.set_exception(outcome)
+            else:
+                self.stats.committed += 1
+                future.set_result(outcome)
+
+    def _write(self, rows: list[dict[str, Any]]) -> list[dict[str, Any] | Exception]:
+        db = self._db
+        assert db is not None
+        try:
+            return self._write_rows(db, rows)
+        finally:
+            # Hand the single write connection back between batches; rendering the
+            # change events may have checked it out again after the COMMIT.
+            db.close()
+
+    def _write_rows(
+        self, db: Session, rows: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | Exception]:
+        table = Post.__table__
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+        try:
+            result = [dict(row._mapping) for row in db.execute(stmt, rows).all()]
+            add_post_tags(db, ((row["id"], row["tags_csv"]) for row in result))
+            db.commit()
+            hot_window.add_rows(db, result)
+            emit_rows_created(db, result)
+            return result
+        except Exception as exc:
+            db.rollback()
+            if len(rows) == 1:
+                return [exc]
+
+        # One bad row must not fail its neighbours: retry them one by one.
+        self.stats.fallback_batches += 1
+        outcomes: list[dict[str, Any] | Exception] = []
+        for row in rows:
+            try:
+                inserted = dict(db.execute(stmt, [row]).one()._mapping)
+                add_post_tags(db, [(inserted["id"], inserted["tags_csv"])])
+                db.commit()
+                hot_window.add_rows(db, [inserted])
+                emit_rows_created(db, [inserted])
+                outcomes.append(inserted)
+            except Exception as exc:
+                db.rollback()
+                outcomes.append(exc)
+        return outcomes
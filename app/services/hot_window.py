@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import desc, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import HOT_WINDOW_SIZE
+from app.models.post import Post
+from app.services.post_rows import SUMMARY_COLUMNS, PostSummary, summarize
+
+# Newest-first ``PostSummary`` rows of the latest posts, per database: one global window
+# plus one per account (seeded on first use). Page-1 style summary reads (``account_id``
+# / ``since`` / ``offset`` only) are answered from here; anything else goes to SQL.
+#
+# Write paths keep the windows current in-line (``upsert`` / ``remove`` / ``add_rows``);
+# writes that cannot say which posts changed call ``invalidate`` instead.
+#
+# Windows are per process, so another worker's writes would go unnoticed. The event bus
+# enables the window while it runs (``enable`` / ``disable``): the in-memory bus assumes
+# a single worker, and the sqlite bus invalidates it for every write tailed from another
+# worker (those show up after one bus poll). Several workers on the in-memory bus must
+# set ``AGENTS_HOT_WINDOW_SIZE=0``.
+
+
+@dataclass
+class HotWindowStats:
+    hits: int = 0
+    misses: int = 0
+    seeds: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Window:
+    posts: list[PostSummary]
+    # True when the window holds every post in its scope (fewer than ``size`` exist).
+    complete: bool
+
+
+@dataclass
+class _DatabaseWindows:
+    generation: int = 0
+    timeline: _Window | None = None
+    accounts: dict[int, _Window] = field(default_factory=dict)
+
+    def windows_for(self, account_id: int | None) -> list[_Window]:
+        windows = [self.timeline] if self.timeline is not None else []
+        if account_id is not None and account_id in self.accounts:
+            windows.append(self.accounts[account_id])
+        return windows
+
+
+_lock = threading.Lock()
+_enabled = False
+# File databases are keyed by path so the writer and reader engines share one state;
+# in-memory databases (tests) are private to their engine.
+_by_path: dict[str, _DatabaseWindows] = {}
+_by_engine: WeakKeyDictionary[Engine, _DatabaseWindows] = WeakKeyDictionary()
+stats = HotWindowStats()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+    invalidate()
+
+
+def _active() -> bool:
+    return _enabled and HOT_WINDOW_SIZE > 0
+
+
+def _key(post: PostSummary) -> tuple[datetime, int]:
+    return post.created_at, post.id
+
+
+def _state(db: Session) -> _DatabaseWindows:
+    bind = db.get_bind()
+    database = bind.url.database
+    if database and database != ":memory:":
+        return _by_path.setdefault(database, _DatabaseWindows())
+    state = _by_engine.get(bind)
+    if state is None:
+        state = _by_engine[bind] = _DatabaseWindows()
+    return state
+
+
+def _states() -> list[_DatabaseWindows]:
+    return [*_by_path.values(), *_by_engine.values()]
+
+
+def _load(db: Session, account_id: int | None) -> _Window:
+    stmt = (
+        select(*SUMMARY_COLUMNS)
+        .order_by(desc(Post.created_at), desc(Post.id))
+        .limit(HOT_WINDOW_SIZE)
+    )
+    if account_id is not None:
+        stmt = stmt.where(Post.account_id == account_id)
+    posts = [PostSummary(*row) for row in db.execute(stmt)]
+    return _Window(posts=posts, complete=len(posts) < HOT_WINDOW_SIZE)
+
+
+def _window(db: Session, account_id: int | None) -> _Window:
+    with _lock:
+        state = _state(db)
+        window = state.timeline if account_id is None else state.accounts.get(account_id)
+        generation = state.generation
+    if window is not None:
+        return window
+    loaded = _load(db, account_id)
+    with _lock:
+        stats.seeds += 1
+        # A write that landed while loading may be missing from ``loaded``; use it for
+        # this read only and seed again next time.
+        if state.generation == generation:
+            if account_id is None:
+                state.timeline = loaded
+            else:
+                state.accounts[account_id] = loaded
+    return loaded
+
+
+def seed(db: Session) -> None:
+    """Load the global window (startup warm-up)."""
+    if _active():
+        _window(db, None)
+
+
+def read(
+    db: Session,
+    *,
+    account_id: int | None = None,
+    since: datetime | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> list[PostSummary] | None:
+    """``list_posts(view="summary")`` for unfiltered first pages, or ``None`` when SQL
+    must answer."""
+    if not _active() or limit <= 0 or offset < 0:
+        return None
+    window = _window(db, account_id)
+    with _lock:
+        posts, exhaustive = window.posts, window.complete
+    if since is not None:
+        # Stored timestamps are naive UTC; SQLite compares them the same way.
+        since = since.replace(tzinfo=None)
+        exhaustive = exhaustive or (bool(posts) and posts[-1].created_at <= since)
+        posts = [post for post in posts if post.created_at > since]
+    if not exhaustive and offset + limit > len(posts):
+        stats.misses += 1
+        return None
+    stats.hits += 1
+    return posts[offset : offset + limit]
+
+
+def _discard(window: _Window, post_id: int) -> None:
+    window.posts = [post for post in window.posts if post.id != post_id]
+
+
+def _insert(window: _Window, post: PostSummary) -> None:
+    if not window.complete and (not window.posts or _key(post) < _key(window.posts[-1])):
+        # Older than everything held: the window never shows it.
+        return
+    # Copy-on-write: readers keep iterating the list they took under the lock.
+    posts = list(window.posts)
+    index = 0
+    while index < len(posts) and _key(posts[index]) > _key(post):
+        index += 1
+    posts.insert(index, post)
+    if len(posts) > HOT_WINDOW_SIZE:
+        del posts[HOT_WINDOW_SIZE:]
+        window.complete = False
+    window.posts = posts
+
+
+def _apply(db: Session, removed: Iterable[int], added: Iterable[PostSummary]) -> None:
+    with _lock:
+        state = _state(db)
+        state.generation += 1
+        windows = [state.timeline, *state.accounts.values()]
+        for post_id in removed:
+            for window in windows:
+                if window is not None:
+                    _discard(window, post_id)
+        for post in added:
+            for window in state.windows_for(post.account_id):
+                _insert(window, post)
+        # After many deletes a partial window gets too thin to answer pages; reload it.
+        if state.timeline is not None and _thin(state.timeline):
+            state.timeline = None
+        for account_id in [key for key, window in state.accounts.items() if _thin(window)]:
+            del state.accounts[account_id]
+
+
+def _thin(window: _Window) -> bool:
+    return not window.complete and len(window.posts) < HOT_WINDOW_SIZE // 2
+
+
+def upsert(db: Session, post: Any) -> None:
+    """A committed create/update of ``post`` (ORM row, fully loaded)."""
+    if _active():
+        _apply(db, [post.id], [summarize(post)])
+
+
+def add_rows(db: Session, rows: Iterable[Any]) -> None:
+    """Committed inserts returned with at least the summary columns (``RETURNING``
+    mappings or ``PostSummary`` rows)."""
+    if _active():
+        _apply(db, [], [summarize(row) for row in rows])
+
+
+def remove(db: Session, post_id: int) -> None:
+    if _active():
+        _apply(db, [post_id], [])
+
+
+def invalidate(db: Session | None = None) -> None:
+    """Drop the windows of ``db``'s database (all when ``None``); they reseed on the
+    next read."""
+    with _lock:
+        stats.invalidations += 1
+        states = [_state(db)] if db is not None else _states()
+        for state in states:
+            state.generation += 1
+            state.timeline = None
+            state.accounts.clear()
+
+
+def info() -> dict[str, Any]:
+    with _lock:
+        states = _states()
+        windows = [state.timeline for state in states if state.timeline is not None]
+        accounts = sum(len(state.accounts) for state in states)
+    return {
+        "enabled": _active(),
+        "size": HOT_WINDOW_SIZE,
+        "timeline_posts": sum(len(window.posts) for window in windows),
+        "account_windows": accounts,
+        **stats.as_dict(),
+    }
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.base import utcnow
+from app.models.import_checkpoint import ImportCheckpoint
+
+
+def load_checkpoint(db: Session, source: str) -> int | None:
+    return db.execute(
+        select(ImportCheckpoint.offset).where(ImportCheckpoint.source == source)
+    ).scalar_one_or_none()
+
+
+def save_checkpoint(db: Session, source: str, offset: int) -> None:
+    """Record ``offset`` for ``source`` in the caller's transaction (no COMMIT)."""
+    stmt = insert(ImportCheckpoint.__table__).values(
+        source=source, offset=offset, updated_at=utcnow()
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ImportCheckpoint.source],
+            set_={"offset": stmt.excluded.offset, "updated_at": stmt.excluded.updated_at},
+        )
+    )
+
+
+def clear_checkpoint(db: Session, source: str) -> None:
+    db.execute(delete(ImportCheckpoint).where(ImportCheckpoint.source == source))
+    db.commit()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import TypeVar
+from collections.abc import Sequence
+from typing import Any, TypeVar
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 ModelT = TypeVar("ModelT")
@@ -12,3 +14,26 @@ def save_and_refresh(db: Session, model: ModelT) -> ModelT:
     db.commit()
     db.refresh(model)
     return model
+
+
+def insert_many(
+    db: Session, model: type, rows: Sequence[dict[str, Any]], *, commit: bool = True
+) -> list[int]:
+    """Insert rows with a single executemany statement and commit once.
+
+    Returns the new primary keys in the same order as ``rows``. With
+    ``commit=False`` the caller owns the transaction (and the rollback).
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+    if not commit:
+        return list(db.execute(stmt, list(rows)).scalars().all())
+    try:
+        ids = list(db.execute(stmt, list(rows)).scalars().all())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
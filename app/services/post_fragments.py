@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from markupsafe import Markup
+from sqlalchemy.orm import Session
+
+from app.core.config import FRAGMENT_CACHE_MAX_BYTES, FRAGMENT_CACHE_MAX_ENTRIES
+from app.core.templating import templates
+from app.models.post import parse_tags
+from app.services.account_cache import AccountSnapshot, cached_accounts_by_id
+from app.services.broadcast import EventPayload
+from app.services.fragment_cache import FragmentCache
+
+CardSwap = Literal["prepend", "replace", "remove"]
+
+
+post_card_cache = FragmentCache(
+    max_entries=FRAGMENT_CACHE_MAX_ENTRIES, max_bytes=FRAGMENT_CACHE_MAX_BYTES
+)
+
+
+def _render_card(post: Any, accounts_by_id: dict[int, AccountSnapshot]) -> str:
+    template = templates.get_template("partials/post_card.html")
+    return template.render(post=post, accounts_by_id=accounts_by_id)
+
+
+def cached_post_card(post: Any, accounts_by_id: dict[int, AccountSnapshot]) -> Markup:
+    """``partials/post_card.html`` for one post, served from ``post_card_cache``.
+
+    The entry is versioned by ``updated_at`` and the account snapshot shown on the
+    card, so edits and account renames miss instead of serving stale HTML.
+    """
+    updated_at = getattr(post, "updated_at", None)
+    if updated_at is None:
+        return Markup(_render_card(post, accounts_by_id))
+    account = accounts_by_id.get(post.account_id) if post.account_id is not None else None
+    html = post_card_cache.get_or_render(
+        post.id, (updated_at, account), lambda: _render_card(post, accounts_by_id)
+    )
+    return Markup(html)
+
+
+def render_post_card(db: Session, post: Any) -> str:
+    """Render ``partials/post_card.html`` for one post (ORM row or ``PostOut``).
+
+    The card only needs the post and the cached account index, so the same HTML can
+    be pushed to every client regardless of which page it is on.
+    """
+    return str(cached_post_card(post, cached_accounts_by_id(db)))
+
+
+def post_event_data(post: Any) -> dict[str, Any]:
+    """Fields every post event carries; they also feed subscription filters."""
+    created_at = getattr(post, "created_at", None)
+    return {
+        "post_id": post.id,
+        "created_at": created_at.isoformat() if created_at else None,
+        "account_id": post.account_id,
+        "status": post.status,
+        "job_name": post.job_name,
+        "tags": parse_tags(post.tags_csv),
+    }
+
+
+def post_card_event(post: Any, swap: CardSwap, html: str = "") -> EventPayload:
+    return EventPayload(
+        event="post_card",
+        data={**post_event_data(post), "swap": swap, "html": html},
+        created_at=datetime.now(UTC),
+    )
+
+
+def build_post_card_event(db: Session, post: Any, swap: CardSwap) -> EventPayload:
+    html = "" if swap == "remove" else render_post_card(db, post)
+    return post_card_event(post, swap, html)
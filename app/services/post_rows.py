@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+
+from app.models.post import Post
+from app.schemas.post import PostOut
+
+
+@dataclass(frozen=True, slots=True)
+class PostSummary:
+    """What a timeline card shows: a plain row, not an identity-mapped ORM object.
+
+    ``human_text``, ``raw_payload_json`` and the structured fields are left out; the
+    card expands them on demand (``GET /api/agents/posts/{id}``).
+    """
+
+    id: int
+    account_id: int | None
+    status: str
+    job_name: str
+    preview: str
+    tags_csv: str
+    created_at: datetime
+    updated_at: datetime
+
+
+_SUMMARY_FIELDS = tuple(field.name for field in fields(PostSummary))
+SUMMARY_COLUMNS = tuple(getattr(Post, name) for name in _SUMMARY_FIELDS)
+# Every PostOut field, in schema order, for serializing rows without the ORM.
+POST_OUT_COLUMNS = tuple(getattr(Post, name) for name in PostOut.model_fields)
+
+
+def summarize(post: Any) -> PostSummary:
+    """``PostSummary`` of an ORM post, a ``PostOut`` or a returned row mapping."""
+    if isinstance(post, Mapping):
+        return PostSummary(*(post[name] for name in _SUMMARY_FIELDS))
+    return PostSummary(*(getattr(post, name) for name in _SUMMARY_FIELDS))
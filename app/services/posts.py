@@ -1,20 +1,89 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict
 from datetime import datetime
+from typing import Any, Literal
 
-from sqlalchemy import Select, and_, desc, select, text
+from sqlalchemy import Row, Select, and_, asc, desc, insert, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.post import Post
+from app.services import hot_window
+from app.services.change_events import (
+    emit_post_change,
+    emit_rows_created,
+    post_change_events,
+    publish,
+)
+from app.services.import_checkpoints import save_checkpoint
 from app.services.persistence import save_and_refresh
+from app.services.post_fragments import post_card_cache
+from app.services.post_rows import (
+    POST_OUT_COLUMNS,
+    SUMMARY_COLUMNS,
+    PostSummary,
+)
+from app.services.search import join_fts
+from app.services.tags import add_post_tags, tag_filter
+
+Cursor = tuple[datetime, int]
+PostView = Literal["full", "rows", "summary", "keys"]
+
+
+def encode_cursor(post: Post) -> str:
+    """Opaque-enough keyset cursor: ``<created_at iso>,<id>``."""
+    return f"{post.created_at.isoformat()},{post.id}"
+
+
+def decode_cursor(value: str) -> Cursor:
+    created_at, _, post_id = value.rpartition(",")
+    if not created_at:
+        raise ValueError(f"Invalid cursor: {value!r}")
+    return datetime.fromisoformat(created_at), int(post_id)
 
 
 def create_post(db: Session, post: Post) -> Post:
-    return save_and_refresh(db, post)
+    post = save_and_refresh(db, post)
+    hot_window.upsert(db, post)
+    emit_post_change(db, post, "created")
+    return post
+
+
+def insert_posts(
+    db: Session,
+    rows: Sequence[dict[str, Any]],
+    *,
+    checkpoint: tuple[str, int] | None = None,
+) -> list[int]:
+    """Bulk-insert post rows and their ``post_tags`` in one transaction.
+
+    ``checkpoint`` is an import ``(source, offset)`` saved in that same transaction.
+    """
+    if not rows:
+        return []
+    stmt = insert(Post.__table__).returning(*SUMMARY_COLUMNS, sort_by_parameter_order=True)
+    try:
+        created = [PostSummary(*row) for row in db.execute(stmt, list(rows))]
+        add_post_tags(db, ((post.id, post.tags_csv) for post in created))
+        if checkpoint is not None:
+            save_checkpoint(db, *checkpoint)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    # RETURNING gives created_at, so the windows place the rows like any other write.
+    hot_window.add_rows(db, created)
+    emit_rows_created(db, (asdict(post) for post in created))
+    return [post.id for post in created]
 
 
 def update_post(db: Session, post: Post) -> Post:
-    return save_and_refresh(db, post)
+    post = save_and_refresh(db, post)
+    hot_window.upsert(db, post)
+    post_card_cache.invalidate(post.id)
+    emit_post_change(db, post, "updated")
+    return post
 
 
 def get_post(db: Session, post_id: int) -> Post | None:
@@ -26,48 +95,111 @@ def list_posts(
     account_id: int | None = None,
     status: str | None = None,
     tag: str | None = None,
+    tags: Sequence[str] | None = None,
+    tag_mode: str = "any",
     since: datetime | None = None,
     limit: int = 50,
     q: str | None = None,
     offset: int = 0,
-) -> list[Post]:
+    before: Cursor | None = None,
+    after: Cursor | None = None,
+    view: PostView = "full",
+) -> list[Post] | list[PostSummary] | list[Row]:
+    """Newest-first posts.
+
+    ``before``/``after`` are keyset cursors on ``(created_at, id)``: ``before`` pages
+    towards older posts, ``after`` towards newer ones. Both ignore ``offset`` and use
+    the ``(account_id, created_at, id)`` index, so deep pages cost the same as page 1.
+    Results are always returned newest first.
+
+    ``tag`` is an exact match; ``tags`` matches any (``tag_mode="any"``) or all
+    (``tag_mode="all"``) of the given tags. Both go through the ``post_tags`` index.
+    ``q`` is an FTS5 query; use ``search_posts`` for relevance order and snippets.
+
+    ``view`` picks what is loaded: ``"full"`` ORM posts, ``"rows"`` plain rows of the
+    ``PostOut`` columns, ``"summary"`` ``PostSummary`` rows (no large columns), or
+    ``"keys"`` ``(created_at, id)`` rows to be loaded later with
+    ``iter_post_summaries``. Summary reads filtered by nothing but ``account_id`` /
+    ``since`` that fit in the hot window are answered from memory.
+    """
+    if view == "summary" and not (q or status or tag or tags) and before is None and after is None:
+        recent = hot_window.read(db, account_id=account_id, since=since, limit=limit, offset=offset)
+        if recent is not None:
+            return recent
+    stmt: Select = _select(view)
     if q:
-        sql = text(
-            """
-            SELECT p.id FROM posts p
-            JOIN posts_fts fts ON p.id = fts.rowid
-            WHERE fts MATCH :q
-            ORDER BY p.created_at DESC
-            LIMIT :limit
-            OFFSET :offset
-            """
-        )
-        ids = [
-            row[0]
-            for row in db.execute(sql, {"q": q, "limit": limit, "offset": offset}).all()
-        ]
-        if not ids:
-            return []
-        # Keep timeline order stable after FTS lookup.
-        stmt = select(Post).where(Post.id.in_(ids)).order_by(desc(Post.created_at))
-        return list(db.execute(stmt).scalars().all())
-
-    stmt: Select = select(Post)
+        # Match inside the same query so filters, ordering and cursors still apply.
+        stmt = join_fts(stmt, q)
     filters = []
     if account_id is not None:
         filters.append(Post.account_id == account_id)
     if status:
         filters.append(Post.status == status)
-    if tag:
-        filters.append(Post.tags_csv.like(f"%{tag}%"))
+    wanted = [*([tag] if tag else []), *(tags or [])]
+    if wanted:
+        filters.append(tag_filter(wanted, tag_mode))
     if since:
         filters.append(Post.created_at > since)
+    key = tuple_(Post.created_at, Post.id)
+    if before is not None:
+        filters.append(key < tuple_(*before))
+    if after is not None:
+        filters.append(key > tuple_(*after))
     if filters:
         stmt = stmt.where(and_(*filters))
-    stmt = stmt.order_by(desc(Post.created_at)).offset(offset).limit(limit)
-    return list(db.execute(stmt).scalars().all())
+
+    if after is not None and before is None:
+        # Walk upwards from the cursor, then flip back to newest-first.
+        stmt = stmt.order_by(asc(Post.created_at), asc(Post.id)).limit(limit)
+        return list(reversed(_fetch(db, stmt, view)))
+
+    stmt = stmt.order_by(desc(Post.created_at), desc(Post.id))
+    if before is None and after is None:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(limit)
+    return _fetch(db, stmt, view)
+
+
+def _select(view: PostView) -> Select:
+    if view == "summary":
+        return select(*SUMMARY_COLUMNS)
+    if view == "keys":
+        return select(Post.created_at, Post.id)
+    if view == "rows":
+        return select(*POST_OUT_COLUMNS)
+    return select(Post)
+
+
+def _fetch(db: Session, stmt: Select, view: PostView) -> list[Any]:
+    result = db.execute(stmt)
+    if view == "summary":
+        return [PostSummary(*row) for row in result]
+    return list(result.scalars().all() if view == "full" else result.all())
+
+
+def iter_post_summaries(
+    db: Session, keys: Sequence[Row], *, chunk_size: int = 25
+) -> Iterator[PostSummary]:
+    """Card rows for a ``list_posts(view="keys")`` page, in order.
+
+    Key rows are loaded ``chunk_size`` at a time as the caller iterates, so only one
+    chunk is alive at once. Posts deleted in the meantime are skipped.
+    """
+    chunk_size = max(chunk_size, 1)
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start : start + chunk_size]
+        stmt = select(*SUMMARY_COLUMNS).where(Post.id.in_([key.id for key in chunk]))
+        loaded = {row.id: PostSummary(*row) for row in db.execute(stmt)}
+        for key in chunk:
+            if key.id in loaded:
+                yield loaded[key.id]
 
 
 def delete_post(db: Session, post: Post) -> None:
+    events = post_change_events(db, post, "deleted")
+    post_id = post.id
     db.delete(post)
     db.commit()
+    hot_window.remove(db, post_id)
+    post_card_cache.invalidate(post_id)
+    publish(events)
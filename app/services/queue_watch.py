@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.services.wsl_queue import queue_file_signature
+
+try:  # Installed with uvicorn[standard]; inotify on Linux, native watchers elsewhere.
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover - depends on the environment
+    awatch = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueueWatchStats:
+    mode: str = "idle"
+    wakeups: int = 0
+    drains: int = 0
+    poll_interval_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+watch_stats = QueueWatchStats()
+
+
+async def _drain_safely(drain: Callable[[], Awaitable[int]]) -> bool:
+    watch_stats.drains += 1
+    try:
+        imported = await drain()
+    except Exception:
+        logger.exception("WSL queue worker failed")
+        return False
+    if imported:
+        logger.info("Imported %s queued WSL progress posts", imported)
+    return True
+
+
+async def _watch_events(
+    queue_path: Path, drain: Callable[[], Awaitable[int]], idle_timeout_ms: int
+) -> None:
+    assert awatch is not None
+    watch_stats.mode = "watch"
+    watched = {queue_path.name, queue_path.with_suffix(".processing").name}
+
+    def only_queue(_change: Any, path: str) -> bool:
+        return Path(path).name in watched
+
+    # The idle timeout only exists to retry an import that failed midway.
+    async for _changes in awatch(
+        queue_path.parent,
+        watch_filter=only_queue,
+        debounce=20,
+        step=5,
+        rust_timeout=idle_timeout_ms,
+        yield_on_timeout=True,
+        recursive=False,
+    ):
+        watch_stats.wakeups += 1
+        if queue_file_signature(queue_path) is not None:
+            await _drain_safely(drain)
+
+
+async def _poll(
+    queue_path: Path, drain: Callable[[], Awaitable[int]], min_ms: int, max_ms: int
+) -> None:
+    watch_stats.mode = "poll"
+    interval = min_ms
+    while True:
+        watch_stats.poll_interval_ms = interval
+        await asyncio.sleep(interval / 1000)
+        watch_stats.wakeups += 1
+        if queue_file_signature(queue_path) is None:
+            # Idle: back off so an empty queue costs a stat() every few seconds.
+            interval = min(interval * 2, max_ms)
+            continue
+        interval = min_ms if await _drain_safely(drain) else max_ms
+
+
+async def watch_wsl_queue(
+    queue_path: Path,
+    drain: Callable[[], Awaitable[int]],
+    *,
+    mode: str = "auto",
+    poll_min_ms: int = 100,
+    poll_max_ms: int = 5000,
+) -> None:
+    """Run ``drain`` whenever the queue file gains lines.
+
+    Uses filesystem notifications when ``watchfiles`` is available and falls back to
+    stat() polling with exponential backoff between ``poll_min_ms`` and ``poll_max_ms``.
+    """
+    if queue_file_signature(queue_path) is not None:
+        await _drain_safely(drain)
+
+    if mode != "poll" and awatch is not None:
+        try:
+            await _watch_events(queue_path, drain, idle_timeout_ms=poll_max_ms)
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Queue file watcher failed; falling back to polling")
+    await _poll(queue_path, drain, poll_min_ms, poll_max_ms)
@@ -4,15 +4,20 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.scene import Scene
+from app.services.change_events import emit_scene_changed
 from app.services.persistence import save_and_refresh
 
 
 def create_scene(db: Session, scene: Scene) -> Scene:
-    return save_and_refresh(db, scene)
+    scene = save_and_refresh(db, scene)
+    emit_scene_changed(scene.id, "created")
+    return scene
 
 
 def update_scene(db: Session, scene: Scene) -> Scene:
-    return save_and_refresh(db, scene)
+    scene = save_and_refresh(db, scene)
+    emit_scene_changed(scene.id, "updated")
+    return scene
 
 
 def get_scene(db: Session, scene_id: int) -> Scene | None:
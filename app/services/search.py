@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from html import escape
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    column,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models.post import Post
+
+posts_fts = table("posts_fts", column("rowid"))
+_fts = literal_column("posts_fts")
+
+# bm25 weights in posts_fts column order (migration 0006): human_text, job_name, goal,
+# result_summary, anomaly_summary, error_summary, data_deps_summary, next_action, tags_csv.
+BM25_WEIGHTS = (2.0, 3.0, 1.5, 1.0, 1.0, 1.0, 0.5, 0.5, 1.5)
+SNIPPET_TOKENS = 12
+
+# SQLite inserts these around matches; the text is HTML-escaped before they become <mark>.
+_OPEN, _CLOSE = "\ue000", "\ue001"
+# OperationalError messages FTS5 uses for unparsable MATCH expressions. Anything else
+# (a missing table or column) is a schema problem and must not read as a bad query.
+_QUERY_ERRORS = ("fts5: syntax error", "unterminated string", "unknown special query")
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    post: Post
+    rank: float
+    snippet: str
+    job_name_highlight: str
+
+
+def fts_match(q: str) -> ColumnElement[bool]:
+    return text("posts_fts MATCH :fts_q").bindparams(fts_q=q)
+
+
+def join_fts(stmt: Select, q: str) -> Select:
+    """Restrict ``stmt`` (selecting from ``posts``) to rows matching the FTS query."""
+    return stmt.join(posts_fts, posts_fts.c.rowid == Post.id).where(fts_match(q))
+
+
+def _marked(value: str | None) -> str:
+    return escape(value or "").replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def search_posts(
+    db: Session,
+    q: str,
+    *,
+    account_id: int | None = None,
+    status: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[SearchHit]:
+    """bm25-ranked FTS search with snippets, in a single joined query.
+
+    ``q`` uses FTS5 query syntax (``term*`` prefix queries hit the prefix indexes).
+    Raises ``ValueError`` for queries FTS5 cannot parse.
+    """
+    rank = func.bm25(_fts, *BM25_WEIGHTS).label("rank")
+    stmt = join_fts(
+        select(
+            Post,
+            rank,
+            func.snippet(_fts, -1, _OPEN, _CLOSE, "…", SNIPPET_TOKENS).label("snippet"),
+            func.highlight(_fts, 1, _OPEN, _CLOSE).label("job_name_highlight"),
+        ),
+        q,
+    )
+    filters = []
+    if account_id is not None:
+        filters.append(Post.account_id == account_id)
+    if status:
+        filters.append(Post.status == status)
+    if filters:
+        stmt = stmt.where(and_(*filters))
+    # bm25 is lower-is-better; id breaks ties towards newer posts.
+    stmt = stmt.order_by(rank, Post.id.desc()).limit(limit).offset(offset)
+    try:
+        rows = db.execute(stmt).all()
+    except OperationalError as exc:
+        if any(fragment in str(exc.orig) for fragment in _QUERY_ERRORS):
+            raise ValueError(f"Invalid search query: {q!r}") from exc
+        raise
+    return [
+        SearchHit(
+            post=row.Post,
+            rank=row.rank,
+            snippet=_marked(row.snippet),
+            job_name_highlight=_marked(row.job_name_highlight),
+        )
+        for row in rows
+    ]
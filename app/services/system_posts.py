@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import orjson
 from sqlalchemy.orm import Session
@@ -10,7 +11,10 @@ from sqlalchemy.orm import Session
 from app.core.config import POST_HUMAN_TEXT_MAX_CHARS
 from app.models.account import Account
 from app.models.post import Post
+from app.services.account_cache import cached_account_id, invalidate_accounts
+from app.services.change_events import emit_account_changed
 from app.services.persistence import save_and_refresh
+from app.services.posts import create_post
 
 SYSTEM_ACCOUNT_NAME = "AGENTS System"
 SYSTEM_ACCOUNT_COLOR = "#2f6fb2"
@@ -40,11 +44,21 @@ def ensure_system_account(db: Session) -> Account:
     if account:
         return account
     account = Account(name=SYSTEM_ACCOUNT_NAME, color=SYSTEM_ACCOUNT_COLOR, settings_json={})
-    return save_and_refresh(db, account)
+    account = save_and_refresh(db, account)
+    invalidate_accounts()
+    emit_account_changed(account.id, "upserted")
+    return account
 
 
-def create_system_post(
-    db: Session,
+def system_account_id(db: Session) -> int:
+    """Id of the system account, served from the account cache on the hot path."""
+    account_id = cached_account_id(db, SYSTEM_ACCOUNT_NAME)
+    if account_id is not None:
+        return account_id
+    return ensure_system_account(db).id
+
+
+def system_post_values(
     *,
     status: str,
     job_name: str,
@@ -64,34 +78,38 @@ def create_system_post(
     next_action: str = "",
     tags_csv: str = "system,progress",
     raw_payload: dict | None = None,
-) -> Post:
-    account = ensure_system_account(db)
-    post = Post(
-        account_id=account.id,
-        status=status,
-        job_name=job_name,
-        env=env,
-        version=version,
-        when_ts=when_ts,
-        human_text=human_text[:POST_HUMAN_TEXT_MAX_CHARS],
-        goal=goal,
-        result_summary=result_summary,
-        latency_p95_ms=latency_p95_ms,
-        tokens=tokens,
-        cost_usd=cost_usd,
-        retries=retries,
-        anomaly_summary=anomaly_summary,
-        error_summary=error_summary,
-        data_deps_summary=data_deps_summary,
-        next_action=next_action,
-        tags_csv=tags_csv,
-        raw_payload_json=(
+) -> dict[str, Any]:
+    """Column values for a system post, without ``account_id``."""
+    return {
+        "status": status,
+        "job_name": job_name,
+        "env": env,
+        "version": version,
+        "when_ts": when_ts,
+        "human_text": human_text[:POST_HUMAN_TEXT_MAX_CHARS],
+        "goal": goal,
+        "result_summary": result_summary,
+        "latency_p95_ms": latency_p95_ms,
+        "tokens": tokens,
+        "cost_usd": cost_usd,
+        "retries": retries,
+        "anomaly_summary": anomaly_summary,
+        "error_summary": error_summary,
+        "data_deps_summary": data_deps_summary,
+        "next_action": next_action,
+        "tags_csv": tags_csv,
+        "raw_payload_json": (
             orjson.dumps(raw_payload, option=orjson.OPT_INDENT_2).decode("utf-8")
             if raw_payload
             else ""
         ),
-    )
-    return save_and_refresh(db, post)
+    }
+
+
+def create_system_post(db: Session, **fields: Any) -> Post:
+    """Create a post under the system account. See ``system_post_values`` for fields."""
+    post = Post(account_id=system_account_id(db), **system_post_values(**fields))
+    return create_post(db, post)
 
 
 def post_update_if_changed(db: Session) -> bool:
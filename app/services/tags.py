@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import ColumnElement, desc, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.post import Post, PostTag, parse_tags
+
+
+def add_post_tags(db: Session, posts: Iterable[tuple[int, str | None]]) -> None:
+    """Insert ``post_tags`` rows for freshly inserted ``(post_id, tags_csv)`` pairs.
+
+    Core bulk inserts bypass the ORM validator on ``Post.tags_csv``; they call this
+    inside the same transaction instead.
+    """
+    rows = [
+        {"post_id": post_id, "tag": tag}
+        for post_id, tags_csv in posts
+        for tag in parse_tags(tags_csv)
+    ]
+    if rows:
+        db.execute(insert(PostTag.__table__), rows)
+
+
+def tag_filter(tags: Sequence[str], mode: str = "any") -> ColumnElement[bool]:
+    """``Post.id IN (...)`` driven by the ``(tag, post_id)`` index.
+
+    ``any`` matches posts carrying at least one tag, ``all`` posts carrying every tag.
+    """
+    wanted = list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
+    ids = select(PostTag.post_id).where(PostTag.tag.in_(wanted))
+    if mode == "all" and len(wanted) > 1:
+        ids = ids.group_by(PostTag.post_id).having(func.count(PostTag.tag) == len(wanted))
+    return Post.id.in_(ids)
+
+
+def tag_counts(
+    db: Session, account_id: int | None = None, limit: int = 50
+) -> list[tuple[str, int]]:
+    """Most used tags, optionally restricted to one account."""
+    stmt = select(PostTag.tag, func.count().label("count")).group_by(PostTag.tag)
+    if account_id is not None:
+        stmt = stmt.join(Post, Post.id == PostTag.post_id).where(Post.account_id == account_id)
+    stmt = stmt.order_by(desc("count"), PostTag.tag).limit(limit)
+    return [(row.tag, row.count) for row in db.execute(stmt).all()]
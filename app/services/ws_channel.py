@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app.schemas.events import WsAck, WsClientMessage, WsSubscribe
+from app.services.broadcast import Broadcaster, EventFilter, EventPayload, Subscription
+
+# Close code when the overflow policy drops a consumer that stopped keeping up.
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+
+@dataclass
+class WsStats:
+    connections: int = 0
+    active: int = 0
+    frames: int = 0
+    events: int = 0
+    acks: int = 0
+    bad_messages: int = 0
+    slow_closes: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+ws_stats = WsStats()
+
+
+def encode_batch(batch: Sequence[EventPayload]) -> bytes:
+    """One binary frame for a batch of events (a single orjson call)."""
+    return orjson.dumps(
+        {
+            "type": "events",
+            # resync events carry no id; ack the last real one.
+            "last_id": next(
+                (payload.id for payload in reversed(batch) if payload.id is not None),
+                None,
+            ),
+            "events": [
+                {
+                    "id": payload.id,
+                    "event": payload.event,
+                    "data": payload.data,
+                    "created_at": payload.created_at,
+                }
+                for payload in batch
+            ],
+        }
+    )
+
+
+class WsChannel:
+    """One ``/api/agents/ws`` connection on top of a broadcaster subscription.
+
+    Nothing is sent until the client's first ``subscribe``. Events go out in batches of
+    at most ``max_batch`` per binary frame; at most ``ack_window`` frames may be
+    unacknowledged, after which events wait in the subscription's bounded queue and
+    its overflow policy applies, exactly as for a slow SSE client.
+
+    ``_send_lock`` covers each frame together with its ``last_sent_id`` update and
+    every subscription swap, so a re-subscribe resumes exactly after the last frame
+    sent. Events already taken from the replaced subscription are dropped: the new
+    one replays them from the broadcaster's history under the new filter (or gets
+    ``resync`` once they have left it).
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        broadcaster: Broadcaster,
+        *,
+        max_queue: int,
+        max_batch: int = 500,
+        batch_window: float = 0.02,
+        ack_window: int = 4,
+    ) -> None:
+        self.websocket = websocket
+        self.broadcaster = broadcaster
+        self.max_queue = max_queue
+        self.max_batch = max(max_batch, 1)
+        self.batch_window = batch_window
+        self.ack_window = max(ack_window, 1)
+        self.subscription: Subscription | None = None
+        self.last_sent_id: int | None = None
+        self.acked_id: int | None = None
+        self._in_flight: deque[int] = deque()
+        self._credit = asyncio.Event()
+        self._subscribed = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        ws_stats.connections += 1
+        ws_stats.active += 1
+        tasks = {
+            asyncio.create_task(self._receive_loop()),
+            asyncio.create_task(self._send_loop()),
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                with contextlib.suppress(WebSocketDisconnect):
+                    task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, WebSocketDisconnect):
+                await asyncio.gather(*tasks)
+            if self.subscription is not None:
+                self.broadcaster.unsubscribe(self.subscription)
+            ws_stats.active -= 1
+
+    async def _send(self, message: dict[str, Any] | bytes) -> None:
+        async with self._send_lock:
+            await self._send_unlocked(message)
+
+    async def _send_unlocked(self, message: dict[str, Any] | bytes) -> None:
+        data = message if isinstance(message, bytes) else orjson.dumps(message)
+        await self.websocket.send_bytes(data)
+
+    async def _receive_loop(self) -> None:
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            raw = message.get("bytes") or message.get("text") or ""
+            try:
+                parsed = WsClientMessage.validate_json(raw)
+            except ValidationError as exc:
+                ws_stats.bad_messages += 1
+                await self._send(
+                    {
+                        "type": "error",
+                        "detail": exc.errors(include_url=False, include_context=False),
+                    }
+                )
+                continue
+            if isinstance(parsed, WsSubscribe):
+                await self._subscribe(parsed)
+            elif isinstance(parsed, WsAck):
+                self._ack(parsed.id)
+
+    async def _subscribe(self, message: WsSubscribe) -> None:
+        async with self._send_lock:
+            # Without an explicit id, a re-subscribe resumes right after what was sent
+            # (no frame is in flight while the lock is held), so changing filters
+            # neither loses nor repeats events.
+            last_event_id = (
+                message.last_event_id if message.last_event_id is not None else self.last_sent_id
+            )
+            if message.last_event_id is not None:
+                # An explicit id rewinds the duplicate guard in the send loop too.
+                self.last_sent_id = message.last_event_id
+            previous = self.subscription
+            self.subscription = self.broadcaster.subscribe(
+                last_event_id=last_event_id,
+                event_filter=EventFilter(**message.filter.model_dump()),
+                fragments=message.fragments,
+                max_queue=self.max_queue,
+            )
+            if previous is not None:
+                self.broadcaster.unsubscribe(previous)
+            await self._send_unlocked(
+                {
+                    "type": "subscribed",
+                    "subscription": self.subscription.id,
+                    "filter": message.filter.model_dump(),
+                    "last_event_id": self.broadcaster.last_event_id,
+                }
+            )
+        self._subscribed.set()
+
+    def _ack(self, event_id: int) -> None:
+        ws_stats.acks += 1
+        self.acked_id = max(event_id, self.acked_id or event_id)
+        while self._in_flight and self._in_flight[0] <= event_id:
+            self._in_flight.popleft()
+        self._credit.set()
+
+    async def _wait_for_credit(self) -> None:
+        while len(self._in_flight) >= self.ack_window:
+            self._credit.clear()
+            await self._credit.wait()
+
+    async def _send_loop(self) -> None:
+        await self._subscribed.wait()
+        while True:
+            subscription = self.subscription
+            batch = await subscription.get_many(window=self.batch_window)
+            if subscription is not self.subscription:
+                # Replaced by a re-subscribe, which already resumed from last_sent_id.
+                continue
+            if batch is None:
+                ws_stats.slow_closes += 1
+                await self.websocket.close(code=WS_CLOSE_SLOW_CONSUMER)
+                return
+            for start in range(0, len(batch), self.max_batch):
+                await self._wait_for_credit()
+                async with self._send_lock:
+                    if subscription is not self.subscription:
+                        break
+                    chunk = self._unsent(batch[start : start + self.max_batch])
+                    if not chunk:
+                        continue
+                    sent_ids = [payload.id for payload in chunk if payload.id is not None]
+                    if sent_ids:
+                        # Recorded before the await: a subscribe waiting on the lock
+                        # must resume after this chunk.
+                        self.last_sent_id = sent_ids[-1]
+                        self._in_flight.append(sent_ids[-1])
+                    await self._send_unlocked(encode_batch(chunk))
+                ws_stats.frames += 1
+                ws_stats.events += len(chunk)
+
+    def _unsent(self, chunk: Sequence[EventPayload]) -> list[EventPayload]:
+        # Replay after a re-subscribe can overlap what was already sent; ids only grow.
+        last = self.last_sent_id
+        return [
+            payload for payload in chunk if last is None or payload.id is None or payload.id > last
+        ]
@@ -1,55 +1,207 @@
 from __future__ import annotations
 
 import logging
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any
 
 import orjson
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from app.services.system_posts import create_system_post
+from app.core.config import WSL_IMPORT_BATCH_SIZE
+from app.services.import_checkpoints import clear_checkpoint, load_checkpoint, save_checkpoint
+from app.services.posts import insert_posts
+from app.services.system_posts import system_account_id, system_post_values
 
 logger = logging.getLogger(__name__)
 
 
-def _swap_queue_file(queue_path: Path) -> Path | None:
+@dataclass
+class WslImportStats:
+    runs: int = 0
+    imported: int = 0
+    failed_lines: int = 0
+    batches: int = 0
+    resumed_files: int = 0
+    last_imported: int = 0
+    last_duration_s: float = 0.0
+    last_rate_per_s: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+import_stats = WslImportStats()
+
+
+def _processing_path(queue_path: Path) -> Path:
+    return queue_path.with_suffix(".processing")
+
+
+def _legacy_checkpoint_path(queue_path: Path) -> Path:
+    # Older versions kept the offset in a file next to the queue.
+    return queue_path.with_suffix(".offset")
+
+
+def _checkpoint_source(queue_path: Path) -> str:
+    return str(queue_path.resolve())
+
+
+def _read_legacy_checkpoint(checkpoint_path: Path) -> int:
+    try:
+        return int(checkpoint_path.read_text(encoding="utf-8").strip() or 0)
+    except FileNotFoundError:
+        return 0
+    except ValueError:
+        logger.warning("Ignoring unreadable WSL queue checkpoint %s", checkpoint_path)
+        return 0
+
+
+def queue_file_signature(queue_path: Path) -> tuple[int, int] | None:
+    """Cheap (mtime_ns, size) of the pending work, or None when there is nothing to do."""
+    try:
+        stat = _processing_path(queue_path).stat()
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        pass
+    try:
+        stat = queue_path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size) if stat.st_size else None
+
+
+def _swap_queue_file(db: Session, queue_path: Path, source: str) -> Path | None:
+    processing_path = _processing_path(queue_path)
+    if processing_path.exists():
+        # A previous run stopped midway; finish it before taking new lines.
+        import_stats.resumed_files += 1
+        return processing_path
     if not queue_path.exists() or queue_path.stat().st_size == 0:
         return None
-    processing_path = queue_path.with_suffix(".processing")
+    # A fresh file starts at offset 0, even if a finished file's checkpoint was left behind.
+    clear_checkpoint(db, source)
     queue_path.replace(processing_path)
     return processing_path
 
 
+def _queued_post_values(account_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "account_id": account_id,
+        **system_post_values(
+            status=str(payload.get("status", "OK")),
+            job_name=str(payload.get("job_name", "codex-run")),
+            human_text=str(payload.get("human_text", ""))[:280],
+            result_summary=str(payload.get("result_summary", "")),
+            error_summary=str(payload.get("error_summary", "")),
+            tags_csv=str(payload.get("tags_csv", "system,progress,codex")),
+            raw_payload=payload.get("raw_payload"),
+        ),
+    }
+
+
+def _insert_one(db: Session, row: dict[str, Any], checkpoint: tuple[str, int]) -> bool:
+    try:
+        import_stats.imported += len(insert_posts(db, [row], checkpoint=checkpoint))
+    except OperationalError:
+        raise
+    except Exception:
+        import_stats.failed_lines += 1
+        logger.exception("Skipping queued WSL progress line rejected by the database")
+        return False
+    return True
+
+
+def _import_file(db: Session, processing_path: Path, source: str, legacy_path: Path) -> None:
+    """Import ``processing_path`` from its checkpoint in batched transactions.
+
+    The byte offset after the last imported line is saved in the ``import_checkpoints``
+    row of ``source`` within the same transaction as the rows, so a crash neither loses
+    nor re-imports a committed batch. A batch the database rejects is retried row by
+    row; rejected rows count as failed lines and the checkpoint moves past them. Only
+    ``OperationalError`` (e.g. "database is locked") stops the import, to be retried
+    from the checkpoint.
+    """
+    account_id = system_account_id(db)
+    offset = load_checkpoint(db, source)
+    if offset is None:
+        offset = _read_legacy_checkpoint(legacy_path)
+    checkpointed = offset
+    # (row, byte offset just past its line)
+    batch: list[tuple[dict[str, Any], int]] = []
+
+    def commit_batch(end_offset: int) -> None:
+        nonlocal checkpointed
+        if batch:
+            rows = [row for row, _ in batch]
+            try:
+                import_stats.imported += len(
+                    insert_posts(db, rows, checkpoint=(source, end_offset))
+                )
+                checkpointed = end_offset
+            except OperationalError:
+                raise
+            except Exception:
+                logger.exception("WSL queue batch rejected; retrying rows one by one")
+                for row, row_end in batch:
+                    if _insert_one(db, row, (source, row_end)):
+                        checkpointed = row_end
+            import_stats.batches += 1
+            batch.clear()
+        if checkpointed < end_offset:
+            # Skipped lines after the last imported row.
+            save_checkpoint(db, source, end_offset)
+            db.commit()
+            checkpointed = end_offset
+
+    with processing_path.open("rb") as fh:
+        fh.seek(offset)
+        for raw_line in fh:
+            offset += len(raw_line)
+            line = raw_line.strip()
+            if not line:
+                continue
+            try:
+                batch.append((_queued_post_values(account_id, orjson.loads(line)), offset))
+            except Exception:
+                import_stats.failed_lines += 1
+                logger.exception("Failed to import queued WSL progress line")
+                continue
+            if len(batch) >= WSL_IMPORT_BATCH_SIZE:
+                commit_batch(offset)
+        commit_batch(offset)
+
+
 def drain_wsl_queue(db: Session, queue_path: Path) -> int:
-    processing_path = _swap_queue_file(queue_path)
+    source = _checkpoint_source(queue_path)
+    processing_path = _swap_queue_file(db, queue_path, source)
     if not processing_path:
         return 0
 
-    created = 0
+    legacy_path = _legacy_checkpoint_path(queue_path)
+    started = time.perf_counter()
+    imported_before = import_stats.imported
     try:
-        with processing_path.open("rb") as fh:
-            for raw_line in fh:
-                line = raw_line.strip()
-                if not line:
-                    continue
-                try:
-                    payload = orjson.loads(line)
-                    create_system_post(
-                        db,
-                        status=str(payload.get("status", "OK")),
-                        job_name=str(payload.get("job_name", "codex-run")),
-                        human_text=str(payload.get("human_text", ""))[:280],
-                        result_summary=str(payload.get("result_summary", "")),
-                        error_summary=str(payload.get("error_summary", "")),
-                        tags_csv=str(payload.get("tags_csv", "system,progress,codex")),
-                        raw_payload=payload.get("raw_payload"),
-                    )
-                    created += 1
-                except Exception:
-                    logger.exception("Failed to import queued WSL progress line")
+        _import_file(db, processing_path, source, legacy_path)
+    except Exception:
+        # Keep the file and checkpoint; the next run resumes after the last commit.
+        logger.exception("WSL queue import stopped; will resume from checkpoint")
+        return import_stats.imported - imported_before
     finally:
-        try:
-            processing_path.unlink(missing_ok=True)
-        except Exception:
-            logger.exception("Failed to remove processing queue file")
+        elapsed = time.perf_counter() - started
+        created = import_stats.imported - imported_before
+        import_stats.runs += 1
+        import_stats.last_imported = created
+        import_stats.last_duration_s = round(elapsed, 4)
+        import_stats.last_rate_per_s = round(created / elapsed, 1) if elapsed > 0 else 0.0
 
+    try:
+        # File first: a checkpoint left without its file is cleared by the next swap.
+        processing_path.unlink(missing_ok=True)
+        legacy_path.unlink(missing_ok=True)
+        clear_checkpoint(db, source)
+    except Exception:
+        logger.exception("Failed to remove processing queue file")
     return created
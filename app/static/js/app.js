@@ -13,6 +13,9 @@
       homeBtn?.getAttribute("hx-get")?.match(/limit=(\d+)/)?.[1] ||
       "50",
     autoRefreshInFlight: false,
+    lastEventId: null,
+    // post ids whose card was already applied from a post_card event.
+    cardPostIds: new Set(),
   };
 
   const setUnread = (value) => {
@@ -96,16 +99,101 @@
     notifyBtn.disabled = true;
   }
 
+  const cardFromHtml = (html) => {
+    const template = document.createElement("template");
+    template.innerHTML = html.trim();
+    return template.content.firstElementChild;
+  };
+
+  // Applies a server-rendered card in place of refetching the timeline.
+  const applyPostCard = (payload) => {
+    const existing = document.getElementById(`post-${payload.post_id}`);
+    if (payload.swap === "remove") {
+      existing?.remove();
+      return;
+    }
+    if (payload.swap === "replace") {
+      if (existing) {
+        const card = cardFromHtml(payload.html);
+        existing.replaceWith(card);
+        htmx.process(card);
+      }
+      return;
+    }
+    const cards = document.querySelector("#timeline .cards");
+    const accountId = cards?.dataset.accountId;
+    const visible =
+      cards &&
+      cards.dataset.live === "true" &&
+      (!accountId || String(payload.account_id) === accountId);
+    const timelineEl = document.getElementById("timeline");
+    if (!visible || !timelineEl || timelineEl.scrollTop > 120) {
+      if (!accountId || String(payload.account_id) === accountId) {
+        markUnread(payload.created_at);
+      }
+      return;
+    }
+    if (existing) return;
+    const card = cardFromHtml(payload.html);
+    cards.querySelector(".empty")?.remove();
+    cards.prepend(card);
+    htmx.process(card);
+    const limit = Number(cards.dataset.limit || state.limit);
+    while (cards.children.length > limit) {
+      cards.lastElementChild.remove();
+    }
+    setUnread(0);
+    if (payload.created_at) state.lastSeen = payload.created_at;
+  };
+
   const startSSE = () => {
-    const source = new EventSource("/api/agents/events");
-    source.addEventListener("new_post", (event) => {
+    // A fresh EventSource does not send Last-Event-ID, so resume via the query string.
+    const params = new URLSearchParams({ fragments: "1" });
+    if (state.lastEventId) params.set("last_event_id", state.lastEventId);
+    const source = new EventSource(`/api/agents/events?${params}`);
+    // Every handled event advances the resume point, whatever its type.
+    const on = (name, handler) => {
+      source.addEventListener(name, (event) => {
+        state.lastEventId = event.lastEventId || state.lastEventId;
+        handler(event);
+      });
+    };
+    const refetchFirstPage = () => {
+      if (isHomeTimelineNearTop()) {
+        refreshTimelineFirstPage();
+        setUnread(0);
+      } else {
+        markUnread();
+      }
+    };
+    on("post_card", (event) => {
+      let payload;
+      try {
+        payload = JSON.parse(event.data);
+      } catch {
+        return;
+      }
+      applyPostCard(payload);
+      if (payload.swap === "prepend") {
+        // Lets the matching post_created skip its refetch; removed there.
+        state.cardPostIds.add(payload.post_id);
+      }
+    });
+    // Every write path emits post_created/updated/deleted, so no polling is needed.
+    on("post_created", (event) => {
       let createdAt = null;
+      let postId = null;
       try {
         const payload = JSON.parse(event.data);
         createdAt = payload.created_at || null;
+        postId = payload.post_id;
       } catch {
         createdAt = null;
       }
+      if (state.cardPostIds.delete(postId)) {
+        // Already handled by its post_card event.
+        return;
+      }
       if (isHomeTimelineNearTop()) {
         refreshTimelineFirstPage();
         setUnread(0);
@@ -116,32 +204,18 @@
         markUnread(createdAt);
       }
     });
+    // The server dropped events for this tab; refetch instead of replaying them.
+    on("resync", refetchFirstPage);
+    // Renames/recolours change the pills on every card, and a cascading delete removes
+    // posts without per-post events.
+    on("account_changed", refetchFirstPage);
+    on("scene_changed", () => {});
     source.addEventListener("error", () => {
       source.close();
       setTimeout(startSSE, 5000);
     });
   };
 
-  const pollForUpdates = async () => {
-    try {
-      const params = new URLSearchParams({ since: state.lastSeen, limit: "1" });
-      const res = await fetch(`/api/agents/posts?${params.toString()}`);
-      if (!res.ok) return;
-      const data = await res.json();
-      if (Array.isArray(data) && data.length > 0) {
-        if (isHomeTimelineNearTop()) {
-          refreshTimelineFirstPage();
-          setUnread(0);
-        } else {
-          markUnread();
-        }
-      }
-    } catch {
-      // ignore network errors
-    }
-  };
-
   refreshLastSeen();
   startSSE();
-  setInterval(pollForUpdates, 20000);
 })();
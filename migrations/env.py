@@ -13,6 +13,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from app.models.base import Base  # noqa: E402
 from app.models.account import Account  # noqa: E402
+import app.models.event_log  # noqa: E402,F401
+import app.models.import_checkpoint  # noqa: E402,F401
 from app.models.post import Post  # noqa: E402
 from app.models.scene import Scene  # noqa: E402
 
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0004_posts_keyset_index"
+down_revision = "0003_expand_human_text_limit"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows written by CURRENT_TIMESTAMP lack the fractional part that Python-side
+    # defaults produce; align them so (created_at, id) cursors compare exactly.
+    op.execute(
+        "UPDATE posts SET created_at = created_at || '.000000' "
+        "WHERE created_at IS NOT NULL AND created_at NOT LIKE '%.%'"
+    )
+    op.execute(
+        "UPDATE posts SET updated_at = updated_at || '.000000' "
+        "WHERE updated_at IS NOT NULL AND updated_at NOT LIKE '%.%'"
+    )
+    op.create_index(
+        "ix_posts_account_created_id",
+        "posts",
+        ["account_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_posts_account_created_id", table_name="posts")
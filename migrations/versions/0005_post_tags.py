@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_post_tags"
+down_revision = "0004_posts_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def _parse_tags(tags_csv: str | None) -> list[str]:
+    # Same rules as app.models.post.parse_tags, frozen for this revision.
+    seen: dict[str, None] = {}
+    for part in (tags_csv or "").split(","):
+        tag = part.strip()
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)
+
+
+def upgrade() -> None:
+    post_tags = op.create_table(
+        "post_tags",
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id"), primary_key=True),
+        sa.Column("tag", sa.String(length=100), primary_key=True),
+    )
+    op.create_index("ix_post_tags_tag_post", "post_tags", ["tag", "post_id"], unique=False)
+
+    bind = op.get_bind()
+    rows = [
+        {"post_id": post_id, "tag": tag}
+        for post_id, tags_csv in bind.execute(
+            sa.text("SELECT id, tags_csv FROM posts WHERE tags_csv != ''")
+        )
+        for tag in _parse_tags(tags_csv)
+    ]
+    if rows:
+        op.bulk_insert(post_tags, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_post_tags_tag_post", table_name="post_tags")
+    op.drop_table("post_tags")
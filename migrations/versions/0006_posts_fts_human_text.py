@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0006_posts_fts_human_text"
+down_revision = "0005_post_tags"
+branch_labels = None
+depends_on = None
+
+_OLD_COLUMNS = (
+    "job_name, goal, result_summary, anomaly_summary, error_summary, "
+    "data_deps_summary, next_action, tags_csv"
+)
+# human_text first: bm25 weights in app.services.search follow this order.
+_NEW_COLUMNS = f"human_text, {_OLD_COLUMNS}"
+
+
+def _drop_fts() -> None:
+    op.execute("DROP TRIGGER IF EXISTS posts_au")
+    op.execute("DROP TRIGGER IF EXISTS posts_ad")
+    op.execute("DROP TRIGGER IF EXISTS posts_ai")
+    op.execute("DROP TABLE IF EXISTS posts_fts")
+
+
+def _create_fts(columns: str, *, prefix: str | None) -> None:
+    values_new = ", ".join(f"new.{name.strip()}" for name in columns.split(","))
+    values_old = ", ".join(f"old.{name.strip()}" for name in columns.split(","))
+    options = f", prefix='{prefix}'" if prefix else ""
+    op.execute(
+        f"""
+        CREATE VIRTUAL TABLE posts_fts USING fts5(
+          {columns},
+          content='posts',
+          content_rowid='id'{options}
+        );
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER posts_ai AFTER INSERT ON posts BEGIN
+          INSERT INTO posts_fts(rowid, {columns}) VALUES (new.id, {values_new});
+        END;
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER posts_ad AFTER DELETE ON posts BEGIN
+          INSERT INTO posts_fts(posts_fts, rowid, {columns})
+          VALUES ('delete', old.id, {values_old});
+        END;
+        """
+    )
+    # Only re-index when an indexed column changes (not on status/metric updates).
+    op.execute(
+        f"""
+        CREATE TRIGGER posts_au AFTER UPDATE OF {columns} ON posts BEGIN
+          INSERT INTO posts_fts(posts_fts, rowid, {columns})
+          VALUES ('delete', old.id, {values_old});
+          INSERT INTO posts_fts(rowid, {columns}) VALUES (new.id, {values_new});
+        END;
+        """
+    )
+    op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    _drop_fts()
+    # Prefix indexes make `term*` queries of 2-3 characters index lookups.
+    _create_fts(_NEW_COLUMNS, prefix="2 3")
+
+
+def downgrade() -> None:
+    _drop_fts()
+    _create_fts(_OLD_COLUMNS, prefix=None)
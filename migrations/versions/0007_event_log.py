@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_event_log"
+down_revision = "0006_posts_fts_human_text"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_log",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event", sa.String(length=50), nullable=False),
+        sa.Column("data_json", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_event_log_created_at", "event_log", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_log_created_at", table_name="event_log")
+    op.drop_table("event_log")
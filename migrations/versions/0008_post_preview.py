@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0008_post_preview"
+down_revision = "0007_event_log"
+branch_labels = None
+depends_on = None
+
+# Must match app.models.post.PREVIEW_CHARS / make_preview.
+_PREVIEW_CHARS = 280
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column(
+            "preview",
+            sa.String(length=_PREVIEW_CHARS),
+            nullable=False,
+            server_default="",
+        ),
+    )
+    op.execute(
+        f"""
+        UPDATE posts SET preview = CASE
+          WHEN length(coalesce(human_text, '')) <= {_PREVIEW_CHARS} THEN coalesce(human_text, '')
+          ELSE substr(human_text, 1, {_PREVIEW_CHARS - 1}) || '…'
+        END
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "preview")
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0009_event_log_origin"
+down_revision = "0008_post_preview"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("event_log", sa.Column("origin_pid", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("event_log", "origin_pid")
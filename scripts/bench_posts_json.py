@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Compare ``GET /api/agents/posts`` serialization paths per 1k rows.
+
+``orm``: ORM ``Post`` objects -> ``list[PostOut]`` validation (``from_attributes``) ->
+JSON, as FastAPI does for a ``response_model``. ``orjson``: plain Core rows of the
+PostOut columns encoded with orjson (the current endpoint). ``ndjson``: the same rows
+as NDJSON lines.
+
+Runs against a throwaway in-memory database:
+
+    python scripts/bench_posts_json.py --rows 5000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Measure the query + serialization, not the in-memory hot window.
+os.environ.setdefault("AGENTS_HOT_WINDOW_SIZE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.models.account  # noqa: E402,F401
+from app.models.base import Base  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.routers.api_posts import _ndjson_lines, _post_json  # noqa: E402
+from app.schemas.post import PostOut  # noqa: E402
+from app.services.posts import list_posts  # noqa: E402
+
+_POSTS = TypeAdapter(list[PostOut])
+
+
+def _seed(db: Session, count: int) -> None:
+    start = datetime(2026, 1, 1)
+    payload = json.dumps({"run": {"steps": list(range(40)), "ok": True}}, indent=2)
+    rows = [
+        {
+            "status": ("OK", "WARN", "FAIL")[index % 3],
+            "job_name": f"job-{index % 20}",
+            "env": "prod",
+            "version": "1.4.2",
+            "human_text": "Nightly sync finished; details follow. " * 20,
+            "goal": "keep the mirror fresh",
+            "result_summary": "synced 12k records",
+            "latency_p95_ms": 123.4,
+            "tokens": 2048,
+            "cost_usd": 0.0123,
+            "retries": index % 2,
+            "tags_csv": "prod,sync",
+            "raw_payload_json": payload,
+            "created_at": start + timedelta(seconds=index),
+            "updated_at": start + timedelta(seconds=index),
+        }
+        for index in range(count)
+    ]
+    db.execute(insert(Post.__table__), rows)
+    db.commit()
+
+
+def _orm(db: Session, limit: int) -> bytes:
+    posts = list_posts(db, limit=limit)
+    content = _POSTS.dump_python(_POSTS.validate_python(posts, from_attributes=True), mode="json")
+    # starlette.responses.JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _orjson(db: Session, limit: int) -> bytes:
+    posts = list_posts(db, limit=limit, view="rows")
+    return orjson.dumps([_post_json(post) for post in posts])
+
+
+def _ndjson(db: Session, limit: int) -> bytes:
+    return b"".join(_ndjson_lines(list_posts(db, limit=limit, view="rows")))
+
+
+def _time(
+    factory: sessionmaker, run: Callable[[Session, int], bytes], rows: int, repeat: int
+) -> tuple[float, int]:
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        # A fresh session each time: no identity map carried between runs.
+        with factory() as db:
+            started = time.perf_counter()
+            size = len(run(db, rows))
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        _seed(db, args.rows)
+        assert orjson.loads(_orjson(db, args.rows)) == json.loads(_orm(db, args.rows))
+
+    per_1k = args.rows / 1000
+    baseline = None
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    for name, run in (("orm", _orm), ("orjson", _orjson), ("ndjson", _ndjson)):
+        elapsed, size = _time(factory, run, args.rows, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            f"{name:>7}: {elapsed / per_1k * 1000:8.2f} ms/1k rows"
+            f"  {size / 1024:9.0f} KiB  x{baseline / elapsed:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+
+from app.models.account import Account
+from app.services.account_cache import cached_account, cached_accounts
+from app.services.accounts import delete_account, upsert_account
+from app.services.system_posts import create_system_post
+
+
+def test_account_cache_serves_reads_and_invalidates_on_write(engine, db):
+    selects: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(_conn, _cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    beta = upsert_account(db, Account(name="Beta", color="#000000"))
+    beta_id = beta.id
+    upsert_account(db, Account(name="Alpha", color="#111111"))
+
+    assert [a.name for a in cached_accounts(db)] == ["Alpha", "Beta"]
+    selects.clear()
+    assert [a.name for a in cached_accounts(db)] == ["Alpha", "Beta"]
+    assert cached_account(db, beta_id).color == "#000000"
+    assert selects == []
+
+    beta.color = "#222222"
+    upsert_account(db, beta)
+    assert cached_account(db, beta_id).color == "#222222"
+
+    create_system_post(db, status="OK", job_name="a", human_text="first")
+    create_system_post(db, status="OK", job_name="a", human_text="warm")
+    selects.clear()
+    create_system_post(db, status="OK", job_name="b", human_text="second")
+    assert not any("FROM accounts" in s for s in selects)
+
+    delete_account(db, beta)
+    assert cached_account(db, beta_id) is None
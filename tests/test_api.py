@@ -1,147 +1,504 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from contextlib import contextmanager
-
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-
-from app.db.session import get_db
-from app.main import app
-from app.models.base import Base
-
-
-@contextmanager
-def build_test_client() -> Iterator[TestClient]:
-    # Shared in-memory DB across request sessions.
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    testing_session_local = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-    Base.metadata.create_all(bind=engine)
-
-    def override_get_db():
-        db = testing_session_local()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    try:
-        with TestClient(app) as client:
-            yield client
-    finally:
-        app.dependency_overrides.pop(get_db, None)
-        Base.metadata.drop_all(bind=engine)
-        engine.dispose()
+import orjson
 
 
-def test_post_lifecycle():
-    with build_test_client() as client:
-        account_resp = client.post(
-            "/api/agents/accounts",
-            json={"name": "Alpha", "color": "#111111", "settings_json": {}},
-        )
-        assert account_resp.status_code == 200
-        account_id = account_resp.json()["id"]
+def test_post_lifecycle(client):
+    account_resp = client.post(
+        "/api/agents/accounts",
+        json={"name": "Alpha", "color": "#111111", "settings_json": {}},
+    )
+    assert account_resp.status_code == 200
+    account_id = account_resp.json()["id"]
 
-        get_resp = client.get(f"/api/agents/accounts/{account_id}")
-        assert get_resp.status_code == 200
+    get_resp = client.get(f"/api/agents/accounts/{account_id}")
+    assert get_resp.status_code == 200
 
-        post_resp = client.post(
-            "/api/agents/posts",
-            json={"account_id": account_id, "job_name": "Job", "status": "OK"},
-        )
-        assert post_resp.status_code == 200
-        post_id = post_resp.json()["id"]
+    post_resp = client.post(
+        "/api/agents/posts",
+        json={"account_id": account_id, "job_name": "Job", "status": "OK"},
+    )
+    assert post_resp.status_code == 200
+    post_id = post_resp.json()["id"]
+
+    patch_resp = client.patch(f"/api/agents/posts/{post_id}", json={"status": "WARN"})
+    assert patch_resp.status_code == 200
+    assert patch_resp.json()["status"] == "WARN"
+
+    delete_resp = client.delete(f"/api/agents/accounts/{account_id}")
+    assert delete_resp.status_code == 200
+
+    list_resp = client.get("/api/agents/posts")
+    assert list_resp.status_code == 200
+    assert len(list_resp.json()) == 1
+    assert list_resp.json()[0]["account_id"] is None
+
+
+def test_system_progress_post(client):
+    resp = client.post(
+        "/api/agents/system/progress",
+        json={
+            "status": "OK",
+            "job_name": "ops-bias-review",
+            "human_text": "Bias incident reviewed and mitigation posted.",
+            "result_summary": "Runbook updated",
+            "tags_csv": "system,incident",
+            "raw_payload": {"source": "test"},
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["job_name"] == "ops-bias-review"
+    assert body["human_text"] == "Bias incident reviewed and mitigation posted."
 
-        patch_resp = client.patch(
-            f"/api/agents/posts/{post_id}", json={"status": "WARN"}
-        )
-        assert patch_resp.status_code == 200
-        assert patch_resp.json()["status"] == "WARN"
 
-        delete_resp = client.delete(f"/api/agents/accounts/{account_id}")
-        assert delete_resp.status_code == 200
+def test_delete_post(client):
+    account = client.post(
+        "/api/agents/accounts",
+        json={"name": "A", "color": "#111111", "settings_json": {}},
+    ).json()
 
-        list_resp = client.get("/api/agents/posts")
-        assert list_resp.status_code == 200
-        assert len(list_resp.json()) == 1
-        assert list_resp.json()[0]["account_id"] is None
+    post_a = client.post(
+        "/api/agents/posts",
+        json={"account_id": account["id"], "job_name": "Job-A1", "status": "OK"},
+    ).json()
+    post_b = client.post(
+        "/api/agents/posts",
+        json={"account_id": account["id"], "job_name": "Job-A2", "status": "OK"},
+    ).json()
 
+    delete_resp = client.delete(f"/api/agents/posts/{post_a['id']}")
+    assert delete_resp.status_code == 200
+    assert delete_resp.json()["post_id"] == post_a["id"]
 
-def test_system_progress_post():
-    with build_test_client() as client:
-        resp = client.post(
-            "/api/agents/system/progress",
+    posts = client.get(f"/api/agents/posts?account_id={account['id']}").json()
+    assert len(posts) == 1
+    assert posts[0]["id"] == post_b["id"]
+
+
+def test_large_human_text_post(client):
+    long_text = "git update note " * 500
+    resp = client.post(
+        "/api/agents/posts",
+        json={"status": "OK", "job_name": "long-note", "human_text": long_text},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["human_text"] == long_text
+
+
+def test_large_system_progress_human_text(client):
+    long_text = "deploy memo " * 400
+    resp = client.post(
+        "/api/agents/system/progress",
+        json={
+            "status": "OK",
+            "job_name": "ops-long-note",
+            "human_text": long_text,
+            "result_summary": "accepted",
+            "tags_csv": "system,progress",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["human_text"] == long_text
+
+
+def test_timeline_cards_show_preview_and_expand_lazily(client):
+    long_text = "status line " * 100
+    created = client.post(
+        "/api/agents/posts",
+        json={"job_name": "long", "human_text": long_text, "goal": "ship it"},
+    ).json()
+    assert created["preview"] == long_text[:279] + "…"
+    bulk = client.post(
+        "/api/agents/posts/bulk", json=[{"job_name": "short", "human_text": "hi"}]
+    ).json()
+
+    detail = client.get(f"/api/agents/posts/{created['id']}")
+    assert detail.status_code == 200
+    assert detail.json()["human_text"] == long_text
+    short = client.get(f"/api/agents/posts/{bulk['results'][0]['id']}").json()
+    assert short["preview"] == "hi"
+    assert client.get("/api/agents/posts/999999").status_code == 404
+
+    page = client.get("/partials/timeline").text
+    assert created["preview"] in page
+    assert long_text not in page
+    assert "ship it" not in page
+    assert f'hx-get="/partials/posts/{created["id"]}"' in page
+
+    expanded = client.get(f"/partials/posts/{created['id']}").text
+    assert long_text in expanded
+    assert "ship it" in expanded
+
+
+def test_posts_list_fast_path_keeps_schema_and_streams_ndjson(client):
+    for index in range(3):
+        client.post(
+            "/api/agents/posts",
             json={
-                "status": "OK",
-                "job_name": "ops-bias-review",
-                "human_text": "Bias incident reviewed and mitigation posted.",
-                "result_summary": "Runbook updated",
-                "tags_csv": "system,incident",
-                "raw_payload": {"source": "test"},
+                "job_name": f"job-{index}",
+                "status": "WARN" if index else "OK",
+                "tokens": index,
+                "cost_usd": 0.25,
+                "raw_payload": {"index": index},
             },
         )
+    for url in ("/api/agents/posts", "/api/agents/posts?status=WARN"):
+        resp = client.get(url)
         assert resp.status_code == 200
-        body = resp.json()
-        assert body["job_name"] == "ops-bias-review"
-        assert body["human_text"] == "Bias incident reviewed and mitigation posted."
+        posts = resp.json()
+        assert posts
+        for post in posts:
+            detail = client.get(f"/api/agents/posts/{post['id']}").json()
+            assert list(post) == list(detail)
+            assert post == detail
 
+    resp = client.get("/api/agents/posts", headers={"Accept": "application/x-ndjson"})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert resp.headers["x-next-cursor"]
+    lines = [orjson.loads(line) for line in resp.text.splitlines()]
+    as_json = client.get("/api/agents/posts")
+    assert lines == as_json.json()
 
-def test_delete_post():
-    with build_test_client() as client:
-        account = client.post(
-            "/api/agents/accounts",
-            json={"name": "A", "color": "#111111", "settings_json": {}},
-        ).json()
-
-        post_a = client.post(
-            "/api/agents/posts",
-            json={"account_id": account["id"], "job_name": "Job-A1", "status": "OK"},
-        ).json()
-        post_b = client.post(
+    # One ETag per representation, and caches must key on Accept.
+    assert resp.headers["vary"] == "Accept"
+    assert as_json.headers["vary"] == "Accept"
+    assert resp.headers["etag"] != as_json.headers["etag"]
+    ndjson = {"Accept": "application/x-ndjson"}
+    assert (
+        client.get(
             "/api/agents/posts",
-            json={"account_id": account["id"], "job_name": "Job-A2", "status": "OK"},
-        ).json()
+            headers={**ndjson, "If-None-Match": as_json.headers["etag"]},
+        ).status_code
+        == 200
+    )
+    revalidated = client.get(
+        "/api/agents/posts",
+        headers={**ndjson, "If-None-Match": resp.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["vary"] == "Accept"
 
-        delete_resp = client.delete(f"/api/agents/posts/{post_a['id']}")
-        assert delete_resp.status_code == 200
-        assert delete_resp.json()["post_id"] == post_a["id"]
 
-        posts = client.get(f"/api/agents/posts?account_id={account['id']}").json()
-        assert len(posts) == 1
-        assert posts[0]["id"] == post_b["id"]
+def test_bulk_posts_json_array(client):
+    resp = client.post(
+        "/api/agents/posts/bulk",
+        json=[
+            {"job_name": "bulk-1", "status": "OK"},
+            {"job_name": "bulk-2", "human_text": "x" * 20000},
+            {"job_name": "bulk-3", "status": "WARN"},
+        ],
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 2
+    assert body["failed"] == 1
+    assert [entry["index"] for entry in body["results"]] == [0, 1, 2]
+    assert body["results"][1]["id"] is None
+    assert "human_text" in body["results"][1]["error"]
 
+    posts = client.get("/api/agents/posts").json()
+    assert {post["job_name"] for post in posts} == {"bulk-1", "bulk-3"}
 
-def test_large_human_text_post():
-    with build_test_client() as client:
-        long_text = "git update note " * 500
-        resp = client.post(
-            "/api/agents/posts",
-            json={"status": "OK", "job_name": "long-note", "human_text": long_text},
-        )
-        assert resp.status_code == 200
-        assert resp.json()["human_text"] == long_text
 
+def test_bulk_posts_ndjson_stream(client):
+    lines = [
+        b'{"job_name": "nd-1"}',
+        b"not json",
+        b'{"job_name": "nd-2", "tags_csv": "a,b"}',
+    ]
+    resp = client.post(
+        "/api/agents/posts/bulk",
+        content=b"\n".join(lines) + b"\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 2
+    assert body["failed"] == 1
+    assert body["results"][1]["error"]
 
-def test_large_system_progress_human_text():
-    with build_test_client() as client:
-        long_text = "deploy memo " * 400
-        resp = client.post(
-            "/api/agents/system/progress",
-            json={
-                "status": "OK",
-                "job_name": "ops-long-note",
-                "human_text": long_text,
-                "result_summary": "accepted",
-                "tags_csv": "system,progress",
-            },
-        )
+
+def test_bulk_posts_rejects_non_array(client):
+    resp = client.post("/api/agents/posts/bulk", json={"job_name": "single"})
+    assert resp.status_code == 400
+
+
+def test_bulk_posts_ndjson_lines_split_across_chunks(monkeypatch, client):
+    from app.services import bulk_ingest
+
+    body = b'{"job_name": "split-1"}\n\n{"job_name": "split-2"}\n{"job_name": "split-3"}'
+    # Odd-sized pieces cut lines (and the blank line) at arbitrary points.
+    chunks = [body[index : index + 7] for index in range(0, len(body), 7)]
+    resp = client.post(
+        "/api/agents/posts/bulk",
+        content=iter(chunks),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["created"] == 3
+    jobs = [post["job_name"] for post in client.get("/api/agents/posts").json()]
+    assert sorted(jobs) == ["split-1", "split-2", "split-3"]
+
+    # JSON arrays are buffered whole, so they are capped.
+    monkeypatch.setattr(bulk_ingest, "BULK_JSON_MAX_BYTES", 16)
+    resp = client.post("/api/agents/posts/bulk", json=[{"job_name": "too-big"}] * 3)
+    assert resp.status_code == 413
+    assert "NDJSON" in resp.json()["detail"]
+
+
+def test_bulk_system_progress(client):
+    resp = client.post(
+        "/api/agents/system/progress/bulk",
+        content=b'{"human_text": "one"}\n{"human_text": "two", "status": "WARN"}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["created"] == 2
+
+    posts = client.get("/api/agents/posts").json()
+    assert len(posts) == 2
+    assert len({post["account_id"] for post in posts}) == 1
+
+
+def test_timeline_pages_render(client):
+    account = client.post(
+        "/api/agents/accounts",
+        json={"name": "Render", "color": "#222222", "settings_json": {}},
+    ).json()
+    client.post(
+        "/api/agents/posts",
+        json={"account_id": account["id"], "job_name": "render-job"},
+    )
+
+    home = client.get("/AGENTS")
+    assert home.status_code == 200
+    assert "render-job" in home.text
+
+    partial = client.get(f"/AGENTS/timeline?account_id={account['id']}")
+    assert partial.status_code == 200
+    assert "Render Timeline" in partial.text
+    assert "render-job" in partial.text
+
+
+def test_timeline_cards_come_from_fragment_cache(client):
+    from app.services.post_fragments import post_card_cache
+
+    post = client.post("/api/agents/posts", json={"job_name": "cache-job"}).json()
+    client.get("/AGENTS/timeline")
+    hits = post_card_cache.stats.hits
+    assert "cache-job" in client.get("/AGENTS/timeline").text
+    assert post_card_cache.stats.hits == hits + 1
+
+    client.patch(f"/api/agents/posts/{post['id']}", json={"job_name": "cache-edited"})
+    text = client.get("/AGENTS/timeline").text
+    assert "cache-edited" in text and "cache-job" not in text
+
+
+def test_large_timeline_pages_are_streamed(monkeypatch, client):
+    import re
+
+    from app.routers import pages
+    from app.services import hot_window
+
+    def cards(html: str) -> list[str]:
+        return re.findall(r'<div class="job">([^<]*)</div>', html)
+
+    monkeypatch.setattr(hot_window, "HOT_WINDOW_SIZE", 0)
+    monkeypatch.setattr(pages, "HTML_STREAM_CHUNK_POSTS", 7)
+    client.post(
+        "/api/agents/posts/bulk",
+        json=[{"job_name": f"stream-{index}"} for index in range(30)],
+    )
+    expected = [f"stream-{index}" for index in reversed(range(30))]
+
+    streamed = client.get("/AGENTS/timeline?limit=100")
+    assert streamed.status_code == 200
+    assert "content-length" not in streamed.headers
+    assert streamed.headers["ETag"]
+    assert cards(streamed.text) == expected
+
+    full = client.get("/AGENTS?limit=150")
+    assert full.text.rstrip().endswith("</html>")
+    assert cards(full.text) == expected
+
+    monkeypatch.setattr(pages, "HTML_STREAM_MIN_LIMIT", 0)
+    rendered = client.get("/AGENTS/timeline?limit=100")
+    assert "content-length" in rendered.headers
+    assert cards(rendered.text) == expected
+
+
+def test_posts_keyset_pagination(client):
+    for index in range(5):
+        client.post("/api/agents/posts", json={"job_name": f"job-{index}"})
+
+    first = client.get("/api/agents/posts?limit=2")
+    assert [post["job_name"] for post in first.json()] == ["job-4", "job-3"]
+
+    second = client.get(
+        "/api/agents/posts",
+        params={"limit": 2, "before": first.headers["X-Next-Cursor"]},
+    )
+    assert [post["job_name"] for post in second.json()] == ["job-2", "job-1"]
+
+    back = client.get(
+        "/api/agents/posts",
+        params={"limit": 2, "after": second.headers["X-Prev-Cursor"]},
+    )
+    assert [post["job_name"] for post in back.json()] == ["job-4", "job-3"]
+
+    assert client.get("/api/agents/posts?before=garbage").status_code == 400
+
+    page = client.get(
+        "/AGENTS/timeline",
+        params={"limit": 2, "page": 2, "before": first.headers["X-Next-Cursor"]},
+    )
+    assert page.status_code == 200
+    assert "job-2" in page.text and "job-4" not in page.text
+    assert "Page 2" in page.text
+    assert "after=" in page.text and "before=" in page.text
+
+
+def test_conditional_get_answers_304_until_data_changes(client):
+    client.post("/api/agents/posts", json={"job_name": "etag-job"})
+
+    for url in ("/api/agents/posts", "/AGENTS/timeline", "/partials/timeline"):
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert first.headers["Last-Modified"]
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+    client.post("/api/agents/posts", json={"job_name": "etag-job-2"})
+    fresh = client.get("/api/agents/posts", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert fresh.json()[0]["job_name"] == "etag-job-2"
+
+    # Account writes change the rendered timeline too.
+    etag = fresh.headers["ETag"]
+    client.post(
+        "/api/agents/accounts",
+        json={"name": "Etag", "color": "#222222", "settings_json": {}},
+    )
+    assert client.get("/api/agents/posts", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_posts_tag_filters_and_facets(client):
+    client.post("/api/agents/posts", json={"job_name": "p1", "tags_csv": "prod, api"})
+    client.post("/api/agents/posts", json={"job_name": "p2", "tags_csv": "preprod,api"})
+    client.post("/api/agents/posts", json={"job_name": "p3", "tags_csv": "prod"})
+    bulk = client.post(
+        "/api/agents/posts/bulk",
+        json=[{"job_name": "p4", "tags_csv": "prod,api,api"}],
+    )
+    assert bulk.json()["created"] == 1
+
+    def jobs(**params):
+        resp = client.get("/api/agents/posts", params=params)
         assert resp.status_code == 200
-        assert resp.json()["human_text"] == long_text
+        return [post["job_name"] for post in resp.json()]
+
+    # Exact match: "prod" must not match "preprod".
+    assert jobs(tag="prod") == ["p4", "p3", "p1"]
+    assert jobs(tag=["prod", "preprod"]) == ["p4", "p3", "p2", "p1"]
+    assert jobs(tag=["prod", "api"], tag_mode="all") == ["p4", "p1"]
+
+    post_id = client.get("/api/agents/posts", params={"tag": "preprod"}).json()[0]["id"]
+    client.patch(f"/api/agents/posts/{post_id}", json={"tags_csv": "prod"})
+    assert jobs(tag="preprod") == []
+    assert jobs(tag="prod") == ["p4", "p3", "p2", "p1"]
+
+    facets = client.get("/api/agents/posts/tags").json()
+    assert facets == [{"tag": "prod", "count": 4}, {"tag": "api", "count": 2}]
+
+
+def test_post_card_fragments_are_pushed_to_fragment_subscribers(client):
+    broadcaster = client.app.state.broadcaster
+    cards = broadcaster.subscribe(fragments=True)
+    plain = broadcaster.subscribe()
+    try:
+        post_id = client.post(
+            "/api/agents/posts", json={"job_name": "live-card", "tags_csv": "a"}
+        ).json()["id"]
+        client.patch(f"/api/agents/posts/{post_id}", json={"job_name": "renamed"})
+        resp = client.post(f"/posts/{post_id}/delete", headers={"HX-Target": f"post-{post_id}"})
+        assert resp.status_code == 200 and resp.text == ""
+
+        card_events = [item for item in cards._items if item.event == "post_card"]
+        assert [item.data["swap"] for item in card_events] == [
+            "prepend",
+            "replace",
+            "remove",
+        ]
+        assert f'id="post-{post_id}"' in card_events[0].data["html"]
+        assert "live-card" in card_events[0].data["html"]
+        assert "renamed" in card_events[1].data["html"]
+        assert [item.event for item in plain._items] == [
+            "post_created",
+            "post_updated",
+            "post_deleted",
+        ]
+    finally:
+        broadcaster.unsubscribe(cards)
+        broadcaster.unsubscribe(plain)
+
+
+def test_websocket_channel_filters_batches_and_acks(client):
+    with client.websocket_connect("/api/agents/ws") as ws:
+        ws.send_text('{"op": "nope"}')
+        assert orjson.loads(ws.receive_bytes())["type"] == "error"
+
+        ws.send_bytes(orjson.dumps({"op": "subscribe", "filter": {"job_name": "ws-a"}}))
+        subscribed = orjson.loads(ws.receive_bytes())
+        assert subscribed["type"] == "subscribed"
+        assert subscribed["filter"]["job_name"] == "ws-a"
+
+        client.post("/api/agents/posts", json={"job_name": "ws-b"})
+        created = client.post("/api/agents/posts", json={"job_name": "ws-a"}).json()
+
+        frame = orjson.loads(ws.receive_bytes())
+        assert frame["type"] == "events"
+        assert [(e["event"], e["data"]["post_id"]) for e in frame["events"]] == [
+            ("post_created", created["id"])
+        ]
+        assert frame["last_id"] == frame["events"][-1]["id"]
+        ws.send_text(orjson.dumps({"op": "ack", "id": frame["last_id"]}).decode())
+
+        # Changing the filter resumes after the last frame sent: nothing is repeated.
+        ws.send_text('{"op": "subscribe", "filter": {"job_name": "ws-b"}}')
+        assert orjson.loads(ws.receive_bytes())["type"] == "subscribed"
+        client.post("/api/agents/posts", json={"job_name": "ws-b"})
+        frame = orjson.loads(ws.receive_bytes())
+        assert [e["data"]["job_name"] for e in frame["events"]] == ["ws-b"]
+
+    metrics = client.get("/api/agents/system/metrics").json()["websocket"]
+    assert metrics["frames"] >= 2 and metrics["acks"] >= 1
+
+
+def test_every_write_path_emits_change_events(client):
+    broadcaster = client.app.state.broadcaster
+    subscription = broadcaster.subscribe()
+    try:
+        client.post("/api/agents/system/progress", json={"job_name": "sys", "human_text": "hi"})
+        client.post("/posts/create", data={"job_name": "form", "status": "OK"})
+        client.post("/api/agents/posts/bulk", json=[{"job_name": "b1"}, {"job_name": "b2"}])
+        account_id = client.post(
+            "/api/agents/accounts", json={"name": "Beta", "color": "#222222"}
+        ).json()["id"]
+        client.post("/api/agents/scenes", json={"name": "s", "scene_json": "{}"})
+
+        events = [(item.event, item.data) for item in subscription._items]
+        created = [data["job_name"] for name, data in events if name == "post_created"]
+        assert created == ["sys", "form", "b1", "b2"]
+        assert (
+            "account_changed",
+            {"account_id": account_id, "action": "upserted"},
+        ) in events
+        assert any(name == "scene_changed" for name, _ in events)
+    finally:
+        broadcaster.unsubscribe(subscription)
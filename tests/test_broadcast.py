@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+
+import orjson
+
+from app.services.broadcast import Broadcaster, EventFilter, EventPayload
+
+
+def _event(index: int) -> EventPayload:
+    return EventPayload(event="new_post", data={"post_id": index}, created_at=datetime.now(UTC))
+
+
+async def _drain(subscription) -> list[EventPayload]:
+    items = []
+    while subscription.lag:
+        items.append(await subscription.get())
+    return items
+
+
+def test_overflow_policies_bound_slow_subscribers():
+    async def scenario() -> None:
+        broadcaster = Broadcaster(max_queue=3)
+        dropping = broadcaster.subscribe("drop_oldest")
+        resyncing = broadcaster.subscribe("resync")
+        leaving = broadcaster.subscribe("disconnect")
+
+        for index in range(5):
+            await broadcaster.publish(_event(index))
+
+        assert [item.data["post_id"] for item in await _drain(dropping)] == [2, 3, 4]
+        assert dropping.stats.dropped == 2
+
+        # Overflow at the 4th event collapses the backlog into one resync marker.
+        assert [item.event for item in await _drain(resyncing)] == [
+            "resync",
+            "new_post",
+        ]
+        assert resyncing.stats.resyncs == 1
+
+        assert leaving.closed and await leaving.get() is None
+        stats = broadcaster.stats()
+        assert stats["disconnected"] == 1
+        assert [item["id"] for item in stats["subscribers"]] == [dropping.id, resyncing.id]
+        assert stats["subscribers"][0]["max_lag"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_get_waits_for_publish():
+    async def scenario() -> None:
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe()
+        waiter = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        broadcaster.publish_nowait(_event(1))
+        assert (await asyncio.wait_for(waiter, 1)).data == {"post_id": 1}
+        broadcaster.unsubscribe(subscription)
+        assert await subscription.get() is None
+
+    asyncio.run(scenario())
+
+
+def test_resume_replays_missed_events_or_resyncs():
+    async def scenario() -> None:
+        broadcaster = Broadcaster(history_size=4)
+        for index in range(6):
+            broadcaster.publish_nowait(_event(index))
+        last = broadcaster.last_event_id
+
+        resumed = broadcaster.subscribe(last_event_id=last - 2)
+        replay = await _drain(resumed)
+        assert [item.data["post_id"] for item in replay] == [4, 5]
+        assert [item.id for item in replay] == [last - 1, last]
+
+        assert broadcaster.subscribe(last_event_id=last).lag == 0
+
+        # Older than the ring buffer (or from a previous process): one resync marker,
+        # carrying the current id so the next reconnect resumes instead of resyncing again.
+        stale = broadcaster.subscribe(last_event_id=broadcaster.first_event_id)
+        (resync,) = await _drain(stale)
+        assert resync.event == "resync"
+        assert resync.id == last
+        assert resync.frame.startswith(f"id: {last}\n".encode())
+        assert broadcaster.subscribe(last_event_id=resync.id).lag == 0
+
+        restarted = Broadcaster()
+        assert restarted.first_event_id > last
+        old = restarted.subscribe(last_event_id=last)
+        assert [item.event for item in await _drain(old)] == ["resync"]
+
+        # Only the events a filtered subscriber would receive count against its queue.
+        for index in range(2):
+            broadcaster.publish_nowait(
+                EventPayload(
+                    event="new_post",
+                    data={"post_id": 100 + index, "account_id": 7, "tags": []},
+                    created_at=datetime.now(UTC),
+                )
+            )
+        narrow = broadcaster.subscribe(
+            last_event_id=broadcaster.last_event_id - 4,
+            event_filter=EventFilter(account_id=7),
+            max_queue=2,
+        )
+        assert [item.data["post_id"] for item in await _drain(narrow)] == [100, 101]
+
+    asyncio.run(scenario())
+
+
+def test_frames_are_encoded_once_and_coalesced():
+    async def scenario() -> None:
+        broadcaster = Broadcaster()
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        broadcaster.publish_nowait(_event(1))
+        broadcaster.publish_nowait(_event(2))
+
+        batch = await first.get_many(window=0.01)
+        assert [item.data["post_id"] for item in batch] == [1, 2]
+        assert (
+            batch[0].frame
+            == (f"id: {batch[0].id}\nevent: new_post\ndata: " + '{"post_id":1}\n\n').encode()
+        )
+        # Subscribers share the same pre-encoded frame object.
+        assert (await second.get()).frame is batch[0].frame
+        assert first.stats.delivered == 2
+
+    asyncio.run(scenario())
+
+
+def test_filtered_subscriptions_only_receive_matching_posts():
+    def post_event(post_id: int, **data) -> EventPayload:
+        return EventPayload(
+            event="new_post",
+            data={"post_id": post_id, "status": "OK", "tags": [], **data},
+            created_at=datetime.now(UTC),
+        )
+
+    async def scenario() -> None:
+        broadcaster = Broadcaster()
+        everything = broadcaster.subscribe()
+        account = broadcaster.subscribe(event_filter=EventFilter(account_id=1))
+        tagged = broadcaster.subscribe(event_filter=EventFilter(tag="prod", status="NG"))
+
+        broadcaster.publish_nowait(post_event(1, account_id=1))
+        broadcaster.publish_nowait(post_event(2, account_id=2, tags=["prod"]))
+        broadcaster.publish_nowait(post_event(3, account_id=2, tags=["prod"], status="NG"))
+        broadcaster.publish_nowait(
+            EventPayload(event="resync", data={}, created_at=datetime.now(UTC))
+        )
+
+        def ids(items):
+            return [item.data.get("post_id", item.event) for item in items]
+
+        assert ids(await _drain(everything)) == [1, 2, 3, "resync"]
+        assert ids(await _drain(account)) == [1, "resync"]
+        assert ids(await _drain(tagged)) == [3, "resync"]
+
+        assert broadcaster.stats()["filter_buckets"] == 2
+        broadcaster.unsubscribe(account)
+        broadcaster.unsubscribe(tagged)
+        assert broadcaster.stats()["filter_buckets"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_connection_manager_limits_and_shares_heartbeats():
+    from app.services.connections import ConnectionLimitReached, ConnectionManager
+
+    broadcaster = Broadcaster()
+    manager = ConnectionManager(broadcaster, max_connections=2, heartbeat_s=10)
+    idle = manager.open(event_filter=EventFilter(account_id=99))
+    busy = manager.open()
+    try:
+        manager.open()
+    except ConnectionLimitReached:
+        pass
+    else:
+        raise AssertionError("third connection should have been rejected")
+    assert manager.rejected == 1
+
+    broadcaster.publish_nowait(_event(1))
+    idle.last_send -= 10
+    busy.last_send -= 10
+    # Only connections with nothing queued get the shared heartbeat frame.
+    assert manager.tick() == 1
+    assert idle.subscription._items[-1].frame.startswith(b"event: heartbeat\ndata: ")
+    assert [item.event for item in busy.subscription._items] == ["new_post"]
+    busy.subscription._items.clear()
+    assert manager.tick() == 1
+
+    busy.sent([_event(2)], 64)
+    stats = manager.stats()
+    assert stats["active"] == 2
+    assert stats["connections"][1]["bytes_sent"] == 64
+
+    manager.close(idle)
+    assert manager.active == 1 and idle.subscription.closed
+    assert broadcaster.stats()["subscribers"][0]["id"] == busy.subscription.id
+
+
+class _FakeWebSocket:
+    def __init__(self) -> None:
+        self.incoming: asyncio.Queue[dict] = asyncio.Queue()
+        self.sent: list[dict] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def receive(self) -> dict:
+        return await self.incoming.get()
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.gate.wait()
+        self.sent.append(orjson.loads(data))
+
+    async def close(self, code: int) -> None:
+        self.incoming.put_nowait({"type": "websocket.disconnect"})
+
+    def client_sends(self, message: dict) -> None:
+        self.incoming.put_nowait({"type": "websocket.receive", "text": orjson.dumps(message)})
+
+
+def test_websocket_resubscribe_during_a_send_resumes_exactly():
+    from app.services.ws_channel import WsChannel
+
+    async def until(condition) -> None:
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.005)
+        raise AssertionError("timed out")
+
+    async def scenario() -> None:
+        broadcaster = Broadcaster(history_size=10)
+        socket = _FakeWebSocket()
+        channel = WsChannel(socket, broadcaster, max_queue=10, batch_window=0)
+        task = asyncio.create_task(channel.run())
+        socket.client_sends({"op": "subscribe"})
+        await until(lambda: socket.sent)
+
+        # Hold the first events frame mid-send and re-subscribe meanwhile.
+        socket.gate.clear()
+        broadcaster.publish_nowait(_event(1))
+        broadcaster.publish_nowait(_event(2))
+        await until(lambda: channel.last_sent_id is not None)
+        socket.client_sends({"op": "subscribe"})
+        await asyncio.sleep(0.02)
+        broadcaster.publish_nowait(_event(3))
+        socket.gate.set()
+        await until(lambda: len(socket.sent) == 4)
+
+        assert [message["type"] for message in socket.sent] == [
+            "subscribed",
+            "events",
+            "subscribed",
+            "events",
+        ]
+        sent = [
+            event["data"]["post_id"]
+            for message in socket.sent
+            if message["type"] == "events"
+            for event in message["events"]
+        ]
+        assert sent == [1, 2, 3]
+        socket.incoming.put_nowait({"type": "websocket.disconnect"})
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
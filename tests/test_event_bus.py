@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+
+from sqlalchemy import create_engine
+
+from app.core.concurrency import run_blocking
+from app.services.broadcast import Broadcaster, EventPayload
+from app.services.event_bus import SqliteEventBus
+
+
+def test_sqlite_bus_fans_out_across_workers(file_engine):
+    async def scenario() -> None:
+        # Two "workers": separate broadcasters tailing the same event_log.
+        workers = [Broadcaster(), Broadcaster()]
+        buses = [
+            SqliteEventBus(b, write_engine=file_engine, read_engine=file_engine, poll_ms=10)
+            for b in workers
+        ]
+        for bus in buses:
+            await bus.start()
+        subscriptions = [b.subscribe() for b in workers]
+        try:
+            buses[0].publish(
+                [
+                    EventPayload(
+                        event="post_created",
+                        data={"post_id": 7, "account_id": None, "tags": []},
+                        created_at=datetime.now(UTC),
+                    )
+                ]
+            )
+            received = [await asyncio.wait_for(sub.get(), timeout=2) for sub in subscriptions]
+        finally:
+            for bus in buses:
+                await bus.stop()
+
+        assert [item.data["post_id"] for item in received] == [7, 7]
+        # Both workers hand out the event_log id, so Last-Event-ID works on either.
+        assert received[0].id == received[1].id == 1
+        assert buses[1].stats.tailed == 1
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_bus_appends_while_the_write_connection_is_held(file_engine):
+    # Single-connection writer pool, like app.db.session.write_engine.
+    write_engine = create_engine(
+        file_engine.url,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.5,
+    )
+    bus = SqliteEventBus(
+        Broadcaster(), write_engine=write_engine, read_engine=file_engine, poll_ms=10
+    )
+    payload = EventPayload(
+        event="post_created",
+        data={"post_id": 1, "account_id": None, "tags": []},
+        created_at=datetime.now(UTC),
+    )
+
+    def publish_inside_a_write() -> None:
+        # Services publish right after COMMIT, often with the connection checked out.
+        with write_engine.connect():
+            bus.publish([payload])
+
+    async def scenario() -> None:
+        await bus.start()
+        subscription = bus.broadcaster.subscribe()
+        try:
+            await run_blocking(publish_inside_a_write)
+            received = await asyncio.wait_for(subscription.get(), timeout=2)
+        finally:
+            await bus.stop()
+        assert received.data["post_id"] == 1
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        write_engine.dispose()
+    assert (bus.stats.written, bus.stats.write_errors) == (1, 0)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.services.fragment_cache import FragmentCache
+
+
+def test_lru_bounded_by_entries_and_bytes():
+    cache = FragmentCache(max_entries=2, max_bytes=10)
+    renders: list[str] = []
+
+    def render(html: str):
+        def inner() -> str:
+            renders.append(html)
+            return html
+
+        return inner
+
+    assert cache.get_or_render(1, "v1", render("aaaa")) == "aaaa"
+    assert cache.get_or_render(1, "v1", render("xxxx")) == "aaaa"
+    cache.get_or_render(2, "v1", render("bbbb"))
+    cache.get_or_render(1, "v1", render("xxxx"))  # 1 is now most recently used
+    cache.get_or_render(3, "v1", render("cccc"))  # evicts 2 (entry limit)
+    assert cache.info()["entries"] == 2
+    assert cache.get_or_render(2, "v1", render("BBBB")) == "BBBB"
+
+    # A new version replaces the entry instead of serving stale HTML.
+    assert cache.get_or_render(3, "v2", render("CCCC")) == "CCCC"
+    cache.get_or_render(4, "v1", render("dddddddd"))  # 8 bytes: byte limit evicts
+    info = cache.info()
+    assert info["bytes"] <= 10 and info["entries"] == 1
+
+    cache.invalidate(4)
+    assert cache.info()["entries"] == 0
+    assert renders == ["aaaa", "bbbb", "cccc", "BBBB", "CCCC", "dddddddd"]
+    assert info["hits"] == 2 and info["misses"] == 6
+    assert info["hit_rate"] == 0.25
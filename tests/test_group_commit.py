@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.models.post import Post, PostTag
+from app.services.group_commit import GroupCommitWriter
+
+
+def _row(job_name: str, **extra) -> dict:
+    return {"account_id": None, "status": "OK", "job_name": job_name, **extra}
+
+
+def test_group_commit_coalesces_concurrent_submits(session_factory, db):
+    async def scenario() -> tuple[list, GroupCommitWriter]:
+        writer = GroupCommitWriter(session_factory, max_batch=8, max_delay_ms=50)
+        writer.start()
+        try:
+            results = await asyncio.gather(
+                *(writer.submit(_row(f"job-{i}", tags_csv="batch")) for i in range(20)),
+                writer.submit(_row("bad", status=None)),
+                return_exceptions=True,
+            )
+        finally:
+            await writer.stop()
+        return results, writer
+
+    results, writer = asyncio.run(scenario())
+    created = [r for r in results if isinstance(r, dict)]
+    assert len(created) == 20
+    assert isinstance(results[-1], Exception)
+    assert len({r["id"] for r in created}) == 20
+    assert all(r["created_at"] is not None for r in created)
+
+    assert writer.stats.committed == 20
+    assert writer.stats.failed == 1
+    assert writer.stats.batches < 21
+    assert writer.stats.max_batch <= 8
+
+    assert db.query(Post).count() == 20
+    assert db.query(PostTag).filter_by(tag="batch").count() == 20
+
+
+def test_group_commit_stop_refuses_new_rows_and_settles_queued_ones(session_factory, db):
+    async def scenario() -> tuple[dict, Exception | None]:
+        writer = GroupCommitWriter(session_factory, max_batch=8, max_delay_ms=50)
+        writer.start()
+        # A row that landed behind _STOP must still be settled, not left hanging.
+        late = asyncio.get_running_loop().create_future()
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0)
+        writer._queue.put_nowait((_row("late"), late))
+        refused = None
+        try:
+            await writer.submit(_row("after-stop"))
+        except RuntimeError as exc:
+            refused = exc
+        await stopping
+        return await asyncio.wait_for(late, 1), refused
+
+    late, refused = asyncio.run(scenario())
+    assert late["job_name"] == "late"
+    assert isinstance(refused, RuntimeError)
+    assert [post.job_name for post in db.query(Post)] == ["late"]
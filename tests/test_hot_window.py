@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models.account import Account
+from app.models.post import Post
+from app.services import change_events, hot_window
+from app.services.broadcast import Broadcaster, EventPayload
+from app.services.event_bus import MemoryEventBus, SqliteEventBus
+from app.services.post_rows import PostSummary
+from app.services.posts import (
+    create_post,
+    delete_post,
+    insert_posts,
+    list_posts,
+    update_post,
+)
+
+
+def _jobs(posts) -> list[str]:
+    return [post.job_name for post in posts]
+
+
+def _recent(db, **kwargs) -> list[str]:
+    return _jobs(list_posts(db, view="summary", **kwargs))
+
+
+async def _caught_up(bus: SqliteEventBus, *others: SqliteEventBus) -> None:
+    """Wait until ``bus`` has appended what it queued and tailed every appended row."""
+    for _ in range(200):
+        written = bus.stats.written + sum(other.stats.written for other in others)
+        if bus.stats.written == bus.stats.queued and bus.stats.tailed >= written:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"bus tailed {bus.stats.tailed} events, expected {written}")
+
+
+def test_hot_window_serves_first_pages_and_follows_writes(monkeypatch, db):
+    monkeypatch.setattr(hot_window, "HOT_WINDOW_SIZE", 3)
+    monkeypatch.setattr(hot_window, "_enabled", True)
+    account = Account(name="hot", color="#000000")
+    db.add(account)
+    db.commit()
+    posts = [create_post(db, Post(job_name=f"job-{index}")) for index in range(4)]
+
+    misses = hot_window.stats.misses
+    first = list_posts(db, limit=2, view="summary")
+    assert _jobs(first) == ["job-3", "job-2"]
+    assert all(isinstance(post, PostSummary) for post in first)
+    # Deeper than the window (3 posts): answered by SQL.
+    assert _recent(db, limit=2, offset=2) == ["job-1", "job-0"]
+    assert hot_window.stats.misses == misses + 1
+    assert _recent(db, since=posts[1].created_at) == ["job-3", "job-2"]
+    # Other views always query, so callers get the row type they asked for.
+    hits = hot_window.stats.hits
+    assert all(isinstance(post, Post) for post in list_posts(db, limit=2))
+    assert hot_window.stats.hits == hits
+
+    posts[3].job_name = "job-3-edited"
+    posts[3].account_id = account.id
+    update_post(db, posts[3])
+    create_post(db, Post(job_name="job-4", account_id=account.id))
+    assert _recent(db, limit=3) == ["job-4", "job-3-edited", "job-2"]
+    assert _recent(db, account_id=account.id) == ["job-4", "job-3-edited"]
+
+    delete_post(db, posts[2])
+    assert _recent(db, limit=2) == ["job-4", "job-3-edited"]
+    # Filtered reads always go to SQL.
+    assert _recent(db, status="OK", limit=3) == ["job-4", "job-3-edited", "job-1"]
+
+    # Core bulk inserts return created_at, so they are placed without a reload.
+    seeds = hot_window.stats.seeds
+    insert_posts(db, [{"job_name": "bulk", "status": "OK"}])
+    assert _recent(db, limit=2) == ["bulk", "job-4"]
+    assert hot_window.stats.seeds == seeds
+    assert _recent(db, since=posts[0].created_at + timedelta(days=1)) == []
+
+
+def test_memory_bus_enables_the_hot_window(monkeypatch):
+    monkeypatch.setattr(hot_window, "_enabled", False)
+
+    async def scenario() -> None:
+        bus = MemoryEventBus(Broadcaster(), asyncio.get_running_loop())
+        await bus.start()
+        assert hot_window.info()["enabled"]
+        await bus.stop()
+        assert not hot_window.info()["enabled"]
+
+    asyncio.run(scenario())
+
+
+def test_disabled_hot_window_reads_go_to_sql(monkeypatch, db):
+    monkeypatch.setattr(hot_window, "HOT_WINDOW_SIZE", 3)
+    monkeypatch.setattr(hot_window, "_enabled", False)
+    for index in range(2):
+        create_post(db, Post(job_name=f"job-{index}"))
+
+    hits, misses, seeds = hot_window.stats.hits, hot_window.stats.misses, hot_window.stats.seeds
+    summaries = list_posts(db, limit=2, view="summary")
+    # Same rows and row type as with the window, straight from SQL.
+    assert _jobs(summaries) == ["job-1", "job-0"]
+    assert all(isinstance(post, PostSummary) for post in summaries)
+    assert hot_window.read(db) is None
+    assert not hot_window.info()["enabled"]
+    stats = hot_window.stats
+    assert (stats.hits, stats.misses, stats.seeds) == (hits, misses, seeds)
+
+
+def test_hot_window_follows_other_workers_through_the_sqlite_bus(monkeypatch, file_engine):
+    monkeypatch.setattr(hot_window, "HOT_WINDOW_SIZE", 3)
+    session_local = sessionmaker(bind=file_engine, autoflush=False, autocommit=False)
+
+    async def scenario() -> None:
+        # This process plays one worker; ``other`` stands in for a second worker process.
+        here, other = (
+            SqliteEventBus(
+                Broadcaster(), write_engine=file_engine, read_engine=file_engine, poll_ms=10
+            )
+            for _ in range(2)
+        )
+        other.origin_pid = here.origin_pid + 1
+        await here.start()
+        change_events.attach(here)
+        db = session_local()
+        try:
+            assert hot_window.info()["enabled"]
+            create_post(db, Post(job_name="own-0"))
+            assert _recent(db) == ["own-0"]
+
+            # Own writes were applied in-line; tailing them back must not reload.
+            seeds = hot_window.stats.seeds
+            create_post(db, Post(job_name="own-1"))
+            await _caught_up(here)
+            assert _recent(db) == ["own-1", "own-0"]
+            assert hot_window.stats.seeds == seeds
+
+            # The other worker writes behind this process's back and announces it.
+            with file_engine.begin() as conn:
+                post_id = conn.execute(
+                    insert(Post.__table__).values(job_name="foreign", status="OK")
+                ).inserted_primary_key[0]
+            other.publish(
+                [
+                    EventPayload(
+                        event="post_created",
+                        data={"post_id": post_id, "account_id": None, "tags": []},
+                        created_at=datetime.now(UTC),
+                    )
+                ]
+            )
+            assert _recent(db) == ["own-1", "own-0"]
+            await _caught_up(here, other)
+            assert _recent(db) == ["foreign", "own-1", "own-0"]
+            assert hot_window.stats.seeds == seeds + 1
+        finally:
+            change_events.detach()
+            db.close()
+            await here.stop()
+        assert not hot_window.info()["enabled"]
+
+    asyncio.run(scenario())
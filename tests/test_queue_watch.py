@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from pathlib import Path
+
+import pytest
+
+from app.services import queue_watch
+from app.services.queue_watch import watch_wsl_queue
+
+
+async def _wait_for_drain(queue: Path, mode: str) -> list[str]:
+    drained: list[str] = []
+    event = asyncio.Event()
+
+    async def drain() -> int:
+        lines = queue.read_text(encoding="utf-8").splitlines()
+        queue.unlink()
+        drained.extend(lines)
+        event.set()
+        return len(lines)
+
+    task = asyncio.create_task(
+        watch_wsl_queue(queue, drain, mode=mode, poll_min_ms=10, poll_max_ms=200)
+    )
+    try:
+        await asyncio.sleep(0.2)
+        assert drained == []
+        queue.write_text('{"human_text":"hi"}\n', encoding="utf-8")
+        await asyncio.wait_for(event.wait(), timeout=3)
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    return drained
+
+
+@pytest.mark.parametrize("mode", ["poll", "auto"])
+def test_watch_wsl_queue_drains_on_append(tmp_path: Path, mode: str):
+    if mode == "auto" and queue_watch.awatch is None:
+        pytest.skip("watchfiles not installed")
+    queue = tmp_path / "wsl_post_queue.ndjson"
+    drained = asyncio.run(_wait_for_drain(queue, mode))
+    assert drained == ['{"human_text":"hi"}']
+    assert queue_watch.watch_stats.mode == ("poll" if mode == "poll" else "watch")
+
+
+def test_watch_wsl_queue_drains_existing_backlog(tmp_path: Path):
+    queue = tmp_path / "wsl_post_queue.ndjson"
+    queue.write_text('{"human_text":"old"}\n', encoding="utf-8")
+    calls: list[int] = []
+
+    async def drain() -> int:
+        calls.append(1)
+        queue.unlink()
+        return 1
+
+    async def scenario() -> None:
+        task = asyncio.create_task(watch_wsl_queue(queue, drain, mode="poll"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert calls == [1]
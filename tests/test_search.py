@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.models.post import Post
+from app.services.posts import list_posts
+from app.services.search import search_posts
+
+MIGRATION = Path(__file__).resolve().parents[1] / "migrations/versions/0006_posts_fts_human_text.py"
+
+
+def _apply_fts_migration(engine) -> None:
+    # posts_fts only exists via migrations; run the real revision against the test DB.
+    spec = importlib.util.spec_from_file_location("fts_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with engine.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+        module.upgrade()
+
+
+def test_search_ranks_and_snippets_human_text(engine, db):
+    _apply_fts_migration(engine)
+    db.add_all(
+        [
+            Post(job_name="deploy", human_text="rollout <b>finished</b> cleanly"),
+            Post(job_name="rollout", human_text="rollout rollout rollback"),
+            Post(job_name="nightly", human_text="nothing relevant"),
+        ]
+    )
+    db.commit()
+
+    hits = search_posts(db, "rollout")
+    assert [hit.post.job_name for hit in hits] == ["rollout", "deploy"]
+    assert hits[0].rank <= hits[1].rank
+    assert hits[0].job_name_highlight == "<mark>rollout</mark>"
+    # Matches are marked, the rest of the text is escaped.
+    assert hits[1].snippet == "<mark>rollout</mark> &lt;b&gt;finished&lt;/b&gt; cleanly"
+
+    assert [hit.post.job_name for hit in search_posts(db, "ro*")] == ["rollout", "deploy"]
+    assert [post.job_name for post in list_posts(db, q="rollout")] == ["rollout", "deploy"]
+
+    post = db.query(Post).filter_by(job_name="nightly").one()
+    post.human_text = "late rollout"
+    db.commit()
+    assert len(search_posts(db, "rollout")) == 3
+
+    try:
+        search_posts(db, '"unterminated')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a malformed query")
@@ -1,41 +1,114 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from uuid import uuid4
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
 
-from app.models.base import Base
 from app.models.post import Post
+from app.services import wsl_queue
+from app.services.import_checkpoints import load_checkpoint, save_checkpoint
 from app.services.wsl_queue import drain_wsl_queue
 
 
-def test_drain_wsl_queue():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    session_local = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-    Base.metadata.create_all(bind=engine)
-
+@pytest.fixture
+def queue() -> Iterator[Path]:
     queue = Path("data") / f"wsl_post_queue_test_{uuid4().hex}.ndjson"
+    try:
+        yield queue
+    finally:
+        for suffix in (".ndjson", ".processing", ".offset"):
+            queue.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def test_drain_wsl_queue(db, queue):
     queue.write_text(
-        '{"status":"OK","job_name":"codex-run","human_text":"queued from wsl","tags_csv":"system,progress,codex"}\n',
+        '{"status":"OK","job_name":"codex-run","human_text":"queued from wsl",'
+        '"tags_csv":"system,progress,codex"}\n',
         encoding="utf-8",
     )
 
-    db = session_local()
-    try:
-        created = drain_wsl_queue(db, queue)
-        assert created == 1
-        posts = db.query(Post).all()
-        assert len(posts) == 1
-        assert posts[0].human_text == "queued from wsl"
-    finally:
-        db.close()
-        queue.unlink(missing_ok=True)
-        Base.metadata.drop_all(bind=engine)
-        engine.dispose()
+    created = drain_wsl_queue(db, queue)
+    assert created == 1
+    posts = db.query(Post).all()
+    assert len(posts) == 1
+    assert posts[0].human_text == "queued from wsl"
+    assert not queue.with_suffix(".processing").exists()
+    assert load_checkpoint(db, str(queue.resolve())) is None
+
+
+def test_drain_wsl_queue_batches_and_skips_bad_lines(monkeypatch, db, queue):
+    monkeypatch.setattr(wsl_queue, "WSL_IMPORT_BATCH_SIZE", 2)
+    lines = [f'{{"human_text":"line {i}"}}' for i in range(5)]
+    lines.insert(2, "{broken")
+    queue.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    batches_before = wsl_queue.import_stats.batches
+    assert drain_wsl_queue(db, queue) == 5
+    assert wsl_queue.import_stats.batches - batches_before == 3
+    assert db.query(Post).count() == 5
+
+
+def test_drain_wsl_queue_resumes_from_checkpoint(db, queue):
+    processing = queue.with_suffix(".processing")
+    first = b'{"human_text":"already imported"}\n'
+    processing.write_bytes(first + b'{"human_text":"pending"}\n')
+    save_checkpoint(db, str(queue.resolve()), len(first))
+    db.commit()
+    queue.write_text('{"human_text":"newer"}\n', encoding="utf-8")
+
+    assert drain_wsl_queue(db, queue) == 1
+    assert [post.human_text for post in db.query(Post).all()] == ["pending"]
+    assert queue.exists()
+
+    assert drain_wsl_queue(db, queue) == 1
+    assert db.query(Post).count() == 2
+
+
+def test_drain_wsl_queue_resumes_from_a_legacy_offset_file(db, queue):
+    processing = queue.with_suffix(".processing")
+    first = b'{"human_text":"already imported"}\n'
+    processing.write_bytes(first + b'{"human_text":"pending"}\n')
+    queue.with_suffix(".offset").write_text(str(len(first)), encoding="utf-8")
+
+    assert drain_wsl_queue(db, queue) == 1
+    assert [post.human_text for post in db.query(Post).all()] == ["pending"]
+    assert not queue.with_suffix(".offset").exists()
+
+
+def test_drain_wsl_queue_skips_rows_the_database_rejects(monkeypatch, db, queue):
+    insert_posts = wsl_queue.insert_posts
+    locked = True
+
+    def picky_insert(db, rows, **kwargs):
+        if any(row["human_text"] == "rejected" for row in rows):
+            raise IntegrityError("INSERT INTO posts", {}, Exception("constraint failed"))
+        if locked and any(row["human_text"] == "later" for row in rows):
+            raise OperationalError("INSERT INTO posts", {}, Exception("database is locked"))
+        return insert_posts(db, rows, **kwargs)
+
+    monkeypatch.setattr(wsl_queue, "insert_posts", picky_insert)
+    monkeypatch.setattr(wsl_queue, "WSL_IMPORT_BATCH_SIZE", 3)
+    lines = ["before", "rejected", "after", "later"]
+    queue.write_text("".join(f'{{"human_text":"{text}"}}\n' for text in lines), encoding="utf-8")
+
+    failed_before = wsl_queue.import_stats.failed_lines
+    # The first batch commits without its rejected row; the lock stops the rest.
+    assert drain_wsl_queue(db, queue) == 2
+    assert wsl_queue.import_stats.failed_lines == failed_before + 1
+    assert queue.with_suffix(".processing").exists()
+    # The checkpoint committed with the first batch, past the rejected row.
+    assert load_checkpoint(db, str(queue.resolve())) == len(
+        "".join(f'{{"human_text":"{text}"}}\n' for text in lines[:3])
+    )
+
+    locked = False
+    assert drain_wsl_queue(db, queue) == 1
+    assert [post.human_text for post in db.query(Post).order_by(Post.id)] == [
+        "before",
+        "after",
+        "later",
+    ]
+    assert not queue.with_suffix(".processing").exists()